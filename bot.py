@@ -4,7 +4,10 @@ import warnings
 import time
 import json
 import sqlite3
+import threading
 import html
+import random
+import atexit
 from dotenv import load_dotenv
 import telegram
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ParseMode, Bot
@@ -19,13 +22,27 @@ from telegram.ext import (
 )
 from apscheduler.schedulers.background import BackgroundScheduler
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
-from urllib.parse import quote_plus
+try:
+    from selectolax.parser import HTMLParser  # Optional C-backed parser, much faster than BeautifulSoup
+except ImportError:
+    HTMLParser = None
+try:
+    from requests_cache import CachedSession, DO_NOT_CACHE  # Optional short-lived cache for search pages
+except ImportError:
+    CachedSession = None
+from urllib.parse import urlsplit
 from datetime import datetime, timedelta
 import re
 import pytz
 import google.generativeai as genai
 import unicodedata
+from collections import OrderedDict
+from functools import lru_cache, partial
+from contextlib import contextmanager
 
 # --- Setup ---
 logging.basicConfig(
@@ -52,59 +69,196 @@ except Exception as e:
     logger.error(f"❌ Failed to configure Google AI: {e}")
     gemini_model = None
 
+# Shared generation settings for the relevance filter (built once, reused by every batch)
+LLM_GENERATION_CONFIG = genai.types.GenerationConfig(
+    candidate_count=1,
+    max_output_tokens=256,  # Room for an index list covering a full LLM_BATCH_SIZE batch
+    temperature=0.1,
+)
+LLM_MAX_WORKERS = 4  # Concurrent Gemini requests per filtering run
+LLM_BATCH_SIZE = 64  # Jobs per Gemini call; larger batches amortize the fixed instruction prompt
+LLM_CACHE_TTL = 14 * 24 * 3600  # Seconds a cached relevance decision stays valid
+LLM_RATE_LIMIT_RETRIES = 5  # Retries of a batch that hit Gemini's quota before it is dropped
+LLM_MAX_BACKOFF = 60  # Upper bound in seconds for a single rate-limit backoff
+# Caps in-flight Gemini calls process-wide, so concurrent alert scrapes share one budget
+gemini_slots = threading.BoundedSemaphore(LLM_MAX_WORKERS)
+
+# --- HTTP Session ---
+# One pooled session shared by all LinkedIn requests (search pages and job pages) so they
+# reuse keep-alive connections instead of paying a TCP + TLS handshake each time.
+# Keep-alive is the requests default, so no explicit Connection header is needed.
+LINKEDIN_SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+SEARCH_CACHE_TTL = 300  # Seconds a search results page is reused when requests-cache is installed
+if CachedSession is not None:
+    # Only search result pages are cached, so overlapping alerts and the post-creation baseline
+    # reuse pages fetched moments ago; job pages and everything else always hit the network.
+    http_session = CachedSession(
+        'http_cache',
+        backend='sqlite',
+        allowable_methods=('GET',),
+        expire_after=DO_NOT_CACHE,
+        urls_expire_after={LINKEDIN_SEARCH_URL: SEARCH_CACHE_TTL},
+    )
+else:
+    http_session = requests.Session()
+http_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.93 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
+})
+http_session.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504], raise_on_status=False),
+))
+
+class RateWindow:
+    """Spaces calls at least `interval` seconds apart across threads, sleeping only when needed."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            # Reserve the next slot before sleeping so concurrent callers queue up behind us
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+class SharedCooldown:
+    """A pause shared across threads: once any caller is throttled, every caller waits it out."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._until = 0.0
+
+    def extend(self, seconds):
+        with self._lock:
+            self._until = max(self._until, time.monotonic() + seconds)
+
+    def wait(self):
+        with self._lock:
+            delay = self._until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+gemini_cooldown = SharedCooldown()  # Set when Gemini answers 429 so parallel batches back off together
+
+# Politeness limits towards LinkedIn, shared by every thread
+description_rate = RateWindow(0.4)  # Job-description pages
+search_page_rate = RateWindow(0.35)  # Search result pages, ~3 requests/second
+SCRAPE_CONCURRENCY = 5  # Search result pages fetched in parallel per scrape
+linkedin_slots = threading.BoundedSemaphore(SCRAPE_CONCURRENCY)  # In-flight search pages across all scrapes
+ALERT_SCRAPE_WORKERS = 4  # Alerts scraped in parallel by the scheduler
+TELEGRAM_SEND_WORKERS = 4  # Chats notified in parallel by the scheduler
+DISPATCHER_WORKERS = 32  # Threads for run_async handlers (searches, alert saves), so a long scrape doesn't stall other chats
+telegram_send_rate = RateWindow(0.04)  # Bot-wide cap across all chats, ~25 messages/second
+
 # --- Text and Link Canonicalization Functions ---
+# Precompiled patterns used by the canonicalization and date helpers (hot path during dedup)
+_JOB_ID_PATTERNS = [
+    re.compile(r'/jobs/view/(\d+)'),  # Standard: /jobs/view/123456
+    re.compile(r'/jobs/(\d+)/'),      # Alternative: /jobs/123456/
+    re.compile(r'job[_-](\d+)'),      # Job ID in parameter: job_123456 or job-123456
+    re.compile(r'jobId[=:](\d+)'),    # JobId parameter: jobId=123456 or jobId:123456
+]
+_DIGITS_RE = re.compile(r'\d+')
+_NONE_RE = re.compile(r'\bnone\b')  # LLM's "no relevant jobs" answer, with or without punctuation
+_WS_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=8192)
 def canonical_link(url: str) -> str:
     """Extract only the numeric LinkedIn job ID for consistent deduplication."""
     # Try multiple patterns to extract LinkedIn job ID
-    patterns = [
-        r'/jobs/view/(\d+)',  # Standard: /jobs/view/123456
-        r'/jobs/(\d+)/',      # Alternative: /jobs/123456/
-        r'job[_-](\d+)',      # Job ID in parameter: job_123456 or job-123456
-        r'jobId[=:](\d+)',    # JobId parameter: jobId=123456 or jobId:123456
-    ]
-    
-    for pattern in patterns:
-        m = re.search(pattern, url)
+    for pattern in _JOB_ID_PATTERNS:
+        m = pattern.search(url)
         if m:
             return m.group(1)
     
     # If no job ID found, normalize the URL by removing query params and fragments
-    return url.lower().split('?')[0].split('#')[0].rstrip('/')
+    parts = urlsplit(url)
+    normalized = f"{parts.scheme}://{parts.netloc}{parts.path}" if parts.netloc else parts.path
+    normalized = normalized.rstrip('/')
+    return normalized if normalized.islower() else normalized.lower()
 
+@lru_cache(maxsize=50000)
 def canonical_text(txt: str) -> str:
-    """Normalize text: lowercase, strip accents, normalize spaces."""
+    """Normalize text: lowercase, strip accents, normalize spaces.
+
+    Memoized: the same titles and company names are canonicalized over and over during dedup.
+    """
     if not txt:
         return ""
-    # Remove accents and non-ASCII characters
-    txt = unicodedata.normalize('NFKD', txt).encode('ascii', 'ignore').decode()
+    # Quick check: plain-ASCII titles (the common case) need no Unicode decomposition
+    if not txt.isascii():
+        # Remove accents and non-ASCII characters
+        if not unicodedata.is_normalized('NFKD', txt):
+            txt = unicodedata.normalize('NFKD', txt)
+        txt = txt.encode('ascii', 'ignore').decode()
     # Normalize whitespace and convert to lowercase
-    return re.sub(r'\s+', ' ', txt).strip().lower()
-
-def parse_date_posted_to_datetime(date_str):
-    """Convert LinkedIn's 'X days ago' format to actual datetime."""
-    date_str = date_str.lower().strip()
-    now = datetime.now(pytz.UTC)
-    
-    # Handle various formats
-    if 'hour' in date_str:
-        hours = int(re.search(r'\d+', date_str).group()) if re.search(r'\d+', date_str) else 1
-        return now - timedelta(hours=hours)
-    elif 'day' in date_str:
-        days = int(re.search(r'\d+', date_str).group()) if re.search(r'\d+', date_str) else 1
-        return now - timedelta(days=days)
-    elif 'week' in date_str:
-        weeks = int(re.search(r'\d+', date_str).group()) if re.search(r'\d+', date_str) else 1
-        return now - timedelta(weeks=weeks)
-    elif 'month' in date_str:
-        months = int(re.search(r'\d+', date_str).group()) if re.search(r'\d+', date_str) else 1
-        return now - timedelta(days=30 * months)
-    elif 'year' in date_str:
-        years = int(re.search(r'\d+', date_str).group()) if re.search(r'\d+', date_str) else 1
-        return now - timedelta(days=365 * years)
-    else:
-        return now  # Default to now if we can't parse it
+    return _WS_RE.sub(' ', txt).strip().lower()
+
+# Relative-date units in LinkedIn's "X <unit>s ago" strings, matched by one compiled pattern
+_DATE_UNITS = {
+    'second': timedelta(seconds=1),
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'month': timedelta(days=30),
+    'year': timedelta(days=365),
+}
+_DATE_RE = re.compile(r'(?:(\d+)\s*)?(' + '|'.join(_DATE_UNITS) + r')')
+
+@lru_cache(maxsize=8192)
+def parse_posted_age(date_str) -> timedelta:
+    """Convert LinkedIn's 'X days ago' format to how long ago the job was posted.
+
+    Memoized: only the age is cached (not an absolute time), and the same few strings repeat
+    across every page of a scrape.
+    """
+    m = _DATE_RE.search(date_str.lower())
+    if not m:
+        return timedelta(0)  # Treat as posted just now if we can't parse it
+    n = int(m.group(1)) if m.group(1) else 1
+    return n * _DATE_UNITS[m.group(2)]
+
+def parse_db_timestamp(value) -> datetime:
+    """Parse an SQLite CURRENT_TIMESTAMP string ('YYYY-MM-DD HH:MM:SS', UTC) into an aware datetime.
+
+    Uses the C-level fromisoformat instead of strptime. Raises ValueError if unparsable.
+    """
+    return datetime.fromisoformat(value.split('.')[0]).replace(tzinfo=pytz.UTC)
+
+@lru_cache(maxsize=512)
+def get_tz(name):
+    """pytz.timezone, memoized: the same few user timezones are looked up on every alert view.
+
+    Raises pytz.UnknownTimeZoneError for invalid names (errors are not cached).
+    """
+    return pytz.timezone(name)
 
 # --- Helper Functions ---
+NOT_MODIFIED = "Message is not modified"  # Prefix of the BadRequest for a no-op message edit
+
+def is_not_modified(error):
+    """True for Telegram's harmless 'message is not modified' edit error."""
+    return error.message.startswith(NOT_MODIFIED)
+
+@contextmanager
+def ignore_not_modified():
+    """Suppress the BadRequest raised when an edit would not change the message; re-raise others."""
+    try:
+        yield
+    except telegram.error.BadRequest as e:
+        if not is_not_modified(e):
+            raise
+
 def safe_answer_callback_query(query):
     """Safely answer callback queries with timeout handling."""
     try:
@@ -125,13 +279,42 @@ def safe_edit_message(query, text, reply_markup=None, parse_mode=None, disable_w
         else:
             query.edit_message_text(text=text, parse_mode=parse_mode)
     except telegram.error.BadRequest as e:
-        if "message is not modified" not in str(e).lower():
+        if not is_not_modified(e):
             logger.warning(f"Failed to edit message: {e}")
     except telegram.error.TimedOut:
         logger.warning("Message edit timed out")
     except Exception as e:
         logger.error(f"Unexpected error editing message: {e}")
 
+def edit_menu(query, context: CallbackContext, text, keyboard, only_if_changed=False):
+    """Edit the callback's message into a menu and remember what was rendered.
+
+    With only_if_changed, the Telegram round trip is skipped when the message already shows
+    exactly this text and keyboard (e.g. re-selecting an option that is already active).
+    """
+    buttons = tuple((b.text, b.callback_data) for row in keyboard.inline_keyboard for b in row)
+    signature = (query.message.message_id, hash((text, buttons)))
+    if only_if_changed and context.user_data.get('_menu_sig') == signature:
+        return
+    # The signature is only known for menus rendered here since the last restart, so an
+    # unchanged edit can still reach Telegram
+    with ignore_not_modified():
+        query.edit_message_text(text, reply_markup=keyboard)
+    context.user_data['_menu_sig'] = signature
+
+def show_menu_later(context: CallbackContext, message, text, keyboard, delay, parse_mode=None):
+    """Edit `message` into a menu after `delay` seconds via the job queue, without blocking the handler."""
+    def _show_menu(job_context: CallbackContext):
+        try:
+            job_context.bot.edit_message_text(
+                chat_id=message.chat_id, message_id=message.message_id,
+                text=text, reply_markup=keyboard, parse_mode=parse_mode
+            )
+        except telegram.error.BadRequest as e:
+            if not is_not_modified(e):
+                logger.warning(f"Failed to show delayed menu: {e}")
+    context.job_queue.run_once(_show_menu, delay)
+
 # --- Constants and State Definitions ---
 (
     MAIN_MENU, PREFERENCES_MENU, GET_SEARCH_KEYWORD, GET_SEARCH_LOCATION,
@@ -140,6 +323,18 @@ def safe_edit_message(query, text, reply_markup=None, parse_mode=None, disable_w
     EDIT_ALERT_PREFERENCES, SET_TIMEZONE
 ) = range(16)
 
+# Update types this bot handles; Telegram doesn't send the others at all
+ALLOWED_UPDATES = ['message', 'callback_query']
+# Long-poll timeout for getUpdates, so an idle bot makes one request per this many seconds
+POLL_TIMEOUT = 50
+
+# Callback patterns registered in several conversation states, compiled once and shared
+MAIN_MENU_PATTERN = re.compile(r'^main_menu$')
+MY_ALERTS_PATTERN = re.compile(r'^my_alerts$')
+ADD_ALERT_PATTERN = re.compile(r'^add_alert$')
+# "Done" in any preference sub-menu goes back to the preferences menu
+PREFERENCES_DONE_PATTERN = re.compile(r'^(dp|wt|exp|jt)_done$')
+
 JOBS_PER_PAGE = 5
 MAX_SCRAPE_PAGES = 5
 
@@ -149,11 +344,26 @@ JOB_TYPES = {"Full-time": "F", "Part-time": "P", "Contract": "C", "Temporary": "
 WORKPLACE_TYPES = {"On-site": "1", "Remote": "2", "Hybrid": "3"}
 
 # --- Database Setup ---
+# Per-connection storage tuning shared by init_db and get_db_connection. WAL is persisted in the
+# database file; the 256 MB memory map covers the whole database, so reads are served from the
+# OS page cache instead of read() syscalls.
+DB_TUNING_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",  # ~20 MB page cache
+)
+
 def init_db():
     """Initialize the SQLite database and create/update tables."""
     conn = sqlite3.connect('job_alerts.db', check_same_thread=False)
     cursor = conn.cursor()
     
+    # Storage tuning; set first so the schema migrations below already run under WAL
+    for pragma in DB_TUNING_PRAGMAS:
+        cursor.execute(pragma)
+    
     # Table for storing user alerts
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS alerts (
@@ -192,21 +402,25 @@ def init_db():
         )
     ''')
     
+    # Cache of LLM relevance decisions so repeated titles skip the Gemini call
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            keywords_canon TEXT NOT NULL,
+            title_canon TEXT NOT NULL,
+            relevant INTEGER NOT NULL,
+            decided_at INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (keywords_canon, title_canon)
+        )
+    ''')
+    
     # --- Safe Table Migration ---
-    # Check if new columns exist and add them if they don't for backwards compatibility
-    try:
-        cursor.execute("SELECT job_title, company FROM sent_jobs LIMIT 1")
-    except sqlite3.OperationalError:
-        logger.info("Upgrading sent_jobs table: adding job_title and company columns...")
-        try:
-            cursor.execute("ALTER TABLE sent_jobs ADD COLUMN job_title TEXT NOT NULL DEFAULT 'N/A'")
-        except sqlite3.OperationalError: pass # Column might exist from a partial migration
-        try:
-            cursor.execute("ALTER TABLE sent_jobs ADD COLUMN company TEXT NOT NULL DEFAULT 'N/A'")
-        except sqlite3.OperationalError: pass # Column might exist
+    # Read the existing columns once and add any that are missing for backwards compatibility
+    existing_columns = {row[1] for row in cursor.execute("PRAGMA table_info(sent_jobs)").fetchall()}
     
-    # Check and add new columns for robust deduplication
     columns_to_add = [
+        ("job_title", "TEXT NOT NULL DEFAULT 'N/A'"),
+        ("company", "TEXT NOT NULL DEFAULT 'N/A'"),
+        # New columns for robust deduplication
         ("chat_id", "INTEGER NOT NULL DEFAULT 0"),
         ("job_id", "TEXT NOT NULL DEFAULT ''"),
         ("canonical_title", "TEXT NOT NULL DEFAULT ''"),
@@ -215,28 +429,49 @@ def init_db():
     ]
     
     for col_name, col_def in columns_to_add:
+        if col_name in existing_columns:
+            continue
+        logger.info(f"Adding {col_name} column to sent_jobs table...")
         try:
-            cursor.execute(f"SELECT {col_name} FROM sent_jobs LIMIT 1")
-        except sqlite3.OperationalError:
-            logger.info(f"Adding {col_name} column to sent_jobs table...")
-            try:
-                cursor.execute(f"ALTER TABLE sent_jobs ADD COLUMN {col_name} {col_def}")
-            except sqlite3.OperationalError as e:
-                logger.warning(f"Failed to add {col_name}: {e}")
+            cursor.execute(f"ALTER TABLE sent_jobs ADD COLUMN {col_name} {col_def}")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Failed to add {col_name}: {e}")
+    
+    # LLM decisions got an expiry timestamp; rows without one count as expired
+    llm_cache_columns = {row[1] for row in cursor.execute("PRAGMA table_info(llm_cache)").fetchall()}
+    if 'decided_at' not in llm_cache_columns:
+        logger.info("Adding decided_at column to llm_cache table...")
+        cursor.execute("ALTER TABLE llm_cache ADD COLUMN decided_at INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("DELETE FROM llm_cache WHERE decided_at < ?", (int(time.time()) - LLM_CACHE_TTL,))
+    
+    # Alerts store their LinkedIn filter params precomputed, so the scheduler reads them as-is
+    alert_columns = {row[1] for row in cursor.execute("PRAGMA table_info(alerts)").fetchall()}
+    missing_filter_columns = [col for col in ALERT_FILTER_COLUMNS if col not in alert_columns]
+    if missing_filter_columns:
+        logger.info("Adding precomputed filter columns to alerts table...")
+        for col in missing_filter_columns:
+            cursor.execute(f"ALTER TABLE alerts ADD COLUMN {col} TEXT")
+        rows = cursor.execute("SELECT id, filters FROM alerts WHERE filters IS NOT NULL").fetchall()
+        cursor.executemany(
+            "UPDATE alerts SET f_E = ?, f_JT = ?, f_TPR = ?, f_WT = ? WHERE id = ?",
+            [(*alert_filter_values(json.loads(row[1])), row[0]) for row in rows]
+        )
     
     # Migrate existing data to new format
     try:
         # Update job_id for existing records
         cursor.execute("UPDATE sent_jobs SET job_id = ? WHERE job_id = '' OR job_id IS NULL", ("",))
         rows = cursor.execute("SELECT rowid, job_link, job_title, company FROM sent_jobs WHERE job_id = ''").fetchall()
-        for row in rows:
-            job_id = canonical_link(row[1])
-            canonical_title = canonical_text(row[2])
-            canonical_company = canonical_text(row[3])
-            cursor.execute(
-                "UPDATE sent_jobs SET job_id = ?, canonical_title = ?, canonical_company = ? WHERE rowid = ?",
-                (job_id, canonical_title, canonical_company, row[0])
-            )
+        # Canonicalize in Python, then write everything back in one batched statement
+        # (same implicit transaction, committed below)
+        updates = [
+            (canonical_link(row[1]), canonical_text(row[2]), canonical_text(row[3]), row[0])
+            for row in rows
+        ]
+        cursor.executemany(
+            "UPDATE sent_jobs SET job_id = ?, canonical_title = ?, canonical_company = ? WHERE rowid = ?",
+            updates
+        )
         
         # Update chat_id for existing records by joining with alerts
         cursor.execute("""
@@ -252,9 +487,15 @@ def init_db():
     # Create indexes for efficient deduplication
     try:
         cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_alert_jobid ON sent_jobs(alert_id, job_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_jobid ON sent_jobs(chat_id, job_id)")
+        # Covering index for the scheduler's per-chat sent_jobs load (index-only scan); it
+        # supersedes the older (chat_id, job_id) index, which is dropped to save write cost
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sent_jobs_chat ON sent_jobs(chat_id, job_id, canonical_title, canonical_company)")
+        cursor.execute("DROP INDEX IF EXISTS idx_chat_jobid")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_canonical ON sent_jobs(chat_id, canonical_title, canonical_company)")
         logger.info("Created deduplication indexes")
+        # Scheduler polling of active alerts and per-chat alert listing
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_active_lastchecked ON alerts(is_active, last_checked)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_chat ON alerts(chat_id)")
     except Exception as e:
         logger.warning(f"Index creation warning: {e}")
     
@@ -262,12 +503,144 @@ def init_db():
     conn.close()
     logger.info("Database initialized and schema updated successfully.")
 
+_db_local = threading.local()
+
 def get_db_connection():
-    """Get a database connection."""
-    conn = sqlite3.connect('job_alerts.db', check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    """Get this thread's long-lived database connection, opening it on first use.
+
+    Connections are reused across handlers and scheduler runs, so callers must not close them.
+    """
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect('job_alerts.db', check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # Per-connection tuning, applied once when the connection is opened
+        for pragma in DB_TUNING_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute("PRAGMA foreign_keys=ON")  # Off by default per connection; needed for ON DELETE CASCADE
+        _db_local.conn = conn
     return conn
 
+# In-memory view of sent_jobs per chat: chat_id -> (job_ids, (canonical_title, canonical_company) pairs).
+# Loaded lazily from SQLite and kept for the most recently used chats only; the INSERT OR IGNORE
+# on sent_jobs stays the authoritative check.
+SENT_JOBS_CACHE_MAX_CHATS = 5000
+_sent_jobs_cache = OrderedDict()
+_sent_jobs_cache_lock = threading.Lock()
+# Bumped by every invalidation. A load that started before an invalidation may have missed the
+# rows it was for, so it is only installed if the generation is unchanged.
+_sent_jobs_generation = 0
+
+def _install_sent_job_keys(chat_id, keys):
+    """Cache a chat's freshly loaded sets, evicting the least recently used chats. Caller holds the lock."""
+    keys = _sent_jobs_cache.setdefault(chat_id, keys)
+    _sent_jobs_cache.move_to_end(chat_id)
+    while len(_sent_jobs_cache) > SENT_JOBS_CACHE_MAX_CHATS:
+        _sent_jobs_cache.popitem(last=False)
+    return keys
+
+def get_sent_job_keys(chat_id):
+    """Return the (job_ids, canonical_pairs) sets of jobs already sent to a chat."""
+    while True:
+        with _sent_jobs_cache_lock:
+            cached = _sent_jobs_cache.get(chat_id)
+            if cached is not None:
+                _sent_jobs_cache.move_to_end(chat_id)
+                return cached
+            generation = _sent_jobs_generation
+        rows = get_db_connection().execute(
+            "SELECT job_id, canonical_title, canonical_company FROM sent_jobs WHERE chat_id = ?", (chat_id,)
+        ).fetchall()
+        loaded = (
+            {row['job_id'] for row in rows},
+            {(row['canonical_title'], row['canonical_company']) for row in rows},
+        )
+        with _sent_jobs_cache_lock:
+            if generation == _sent_jobs_generation:
+                return _install_sent_job_keys(chat_id, loaded)
+        # Invalidated while loading: the rows read may predate that change, so read again
+
+def preload_sent_job_keys(chat_ids):
+    """Load the sent-job sets of every given chat not yet cached, with one query per 500 chats."""
+    with _sent_jobs_cache_lock:
+        missing = [chat_id for chat_id in set(chat_ids) if chat_id not in _sent_jobs_cache]
+    conn = get_db_connection()
+    for i in range(0, len(missing), 500):
+        chunk = missing[i:i + 500]
+        with _sent_jobs_cache_lock:
+            generation = _sent_jobs_generation
+        loaded = {chat_id: (set(), set()) for chat_id in chunk}
+        rows = conn.execute(
+            f"SELECT chat_id, job_id, canonical_title, canonical_company FROM sent_jobs "
+            f"WHERE chat_id IN ({','.join('?' * len(chunk))})", chunk
+        )
+        for row in rows:
+            job_ids, canonical_pairs = loaded[row['chat_id']]
+            job_ids.add(row['job_id'])
+            canonical_pairs.add((row['canonical_title'], row['canonical_company']))
+        with _sent_jobs_cache_lock:
+            # Possibly stale after an invalidation; get_sent_job_keys loads those chats on demand
+            if generation == _sent_jobs_generation:
+                for chat_id, keys in loaded.items():
+                    _install_sent_job_keys(chat_id, keys)
+
+def record_sent_jobs(conn, alert_id, chat_id, jobs):
+    """Insert jobs into sent_jobs in one batch; the unique indexes silently drop duplicates."""
+    rows = [
+        (alert_id, chat_id, job['Link'], canonical_link(job['Link']), job['Title'], job['Company'],
+         canonical_text(job['Title']), canonical_text(job['Company']))
+        for job in jobs
+    ]
+    with conn:
+        conn.executemany("""
+            INSERT OR IGNORE INTO sent_jobs 
+            (alert_id, chat_id, job_link, job_id, job_title, company, canonical_title, canonical_company) 
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+def invalidate_sent_jobs_cache(chat_id):
+    """Drop a chat's cached sent jobs after sent_jobs is changed outside the scheduler."""
+    global _sent_jobs_generation
+    with _sent_jobs_cache_lock:
+        _sent_jobs_cache.pop(chat_id, None)
+        _sent_jobs_generation += 1
+
+# In-memory copy of each chat's My Alerts list: chat_id -> [{id, keywords, location, is_active}].
+# Loaded lazily; handlers that pause, resume or delete an alert patch it in place, and new
+# alerts invalidate it.
+_alert_list_cache = {}
+_alert_list_cache_lock = threading.Lock()
+
+def get_alert_list(chat_id):
+    """Return the alerts shown on a chat's My Alerts screen, in creation order."""
+    with _alert_list_cache_lock:
+        cached = _alert_list_cache.get(chat_id)
+    if cached is None:
+        rows = get_db_connection().execute(
+            "SELECT id, keywords, location, is_active FROM alerts WHERE chat_id = ? ORDER BY id", (chat_id,)
+        ).fetchall()
+        with _alert_list_cache_lock:
+            cached = _alert_list_cache.setdefault(chat_id, [dict(row) for row in rows])
+    return cached
+
+def set_cached_alert_status(chat_id, alert_id, is_active):
+    """Reflect a pause/resume in the cached alert list, if the chat's list is cached."""
+    with _alert_list_cache_lock:
+        for alert in _alert_list_cache.get(chat_id, ()):
+            if alert['id'] == alert_id:
+                alert['is_active'] = is_active
+
+def drop_cached_alert(chat_id, alert_id):
+    """Remove a deleted alert from the cached alert list, if the chat's list is cached."""
+    with _alert_list_cache_lock:
+        if chat_id in _alert_list_cache:
+            _alert_list_cache[chat_id] = [alert for alert in _alert_list_cache[chat_id] if alert['id'] != alert_id]
+
+def invalidate_alert_list_cache(chat_id):
+    """Drop a chat's cached alert list after an alert is added."""
+    with _alert_list_cache_lock:
+        _alert_list_cache.pop(chat_id, None)
+
 # --- Data Persistence Helper ---
 def get_user_prefs(context: CallbackContext) -> dict:
     """Safely get user preferences, initializing if not present."""
@@ -280,28 +653,124 @@ def get_user_prefs(context: CallbackContext) -> dict:
         }
     return context.user_data['preferences']
 
+def get_user_timezone(context: CallbackContext, chat_id: int):
+    """Return the user's saved timezone (or None), cached in user_data after the first lookup."""
+    if 'timezone' not in context.user_data:
+        tz_row = get_db_connection().execute("SELECT timezone FROM user_settings WHERE chat_id = ?", (chat_id,)).fetchone()
+        context.user_data['timezone'] = tz_row['timezone'] if tz_row else None
+    return context.user_data['timezone']
+
 # --- UI Generation Functions ---
-def make_main_menu(context: CallbackContext) -> (str, InlineKeyboardMarkup):
-    text = "👋 Welcome to Job Quest!"
-    keyboard = [
-        [InlineKeyboardButton("🚀 Start Search", callback_data="start_search")],
-        [InlineKeyboardButton("🔔 Set Alert", callback_data="set_alert")],
-        [InlineKeyboardButton("📋 Preferences", callback_data="prefs")]
+# Menus that never change are built once at import time and shared by every render
+MAIN_MENU_TEXT = "👋 Welcome to Job Quest!"
+MAIN_MENU_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🚀 Start Search", callback_data="start_search")],
+    [InlineKeyboardButton("🔔 Set Alert", callback_data="set_alert")],
+    [InlineKeyboardButton("📋 Preferences", callback_data="prefs")]
+])
+
+def build_option_buttons(options_dict: dict, callback_prefix: str) -> list:
+    """Pre-build (option_id, plain_button, selected_button) for each option of a selection menu."""
+    return [
+        (
+            option_id,
+            InlineKeyboardButton(option_text, callback_data=f"{callback_prefix}_{option_id}_{option_text}"),
+            InlineKeyboardButton(f"✅ {option_text}", callback_data=f"{callback_prefix}_{option_id}_{option_text}"),
+        )
+        for option_text, option_id in options_dict.items()
     ]
-    return text, InlineKeyboardMarkup(keyboard)
+
+def render_option_rows(option_buttons: list, is_selected) -> list:
+    """One keyboard row per option, picking the ✅ variant where is_selected(option_id) is true."""
+    return [[selected_btn if is_selected(option_id) else plain_btn] for option_id, plain_btn, selected_btn in option_buttons]
+
+DATE_POSTED_BUTTONS = build_option_buttons(DATE_POSTED_OPTIONS, "dp")
+DATE_POSTED_FOOTER = [
+    [InlineKeyboardButton("Clear Filter", callback_data="dp_clear_None")],
+    [InlineKeyboardButton("✔️ Done", callback_data="dp_done")]
+]
+WORKPLACE_BUTTONS = build_option_buttons(WORKPLACE_TYPES, "wt")
+WORKPLACE_FOOTER = [
+    [InlineKeyboardButton("Clear Filter", callback_data="wt_clear_None")],
+    [InlineKeyboardButton("✔️ Done", callback_data="wt_done")]
+]
+EXPERIENCE_BUTTONS = build_option_buttons(EXPERIENCE_LEVELS, "exp")
+JOB_TYPE_BUTTONS = build_option_buttons(JOB_TYPES, "jt")
+# The alert and edit-alert menus show the same options under their own callback prefixes
+ALERT_MENU_BUTTONS = {
+    f"{scope}_{kind}": build_option_buttons(options, f"{scope}_{kind}")
+    for scope in ("alert", "edit_alert")
+    for kind, options in (("dp", DATE_POSTED_OPTIONS), ("wt", WORKPLACE_TYPES), ("exp", EXPERIENCE_LEVELS), ("jt", JOB_TYPES))
+}
+ALERT_MENU_FOOTERS = {
+    prefix: ([[InlineKeyboardButton("Clear Filter", callback_data=f"{prefix}_clear_None")]] if prefix.endswith(("_dp", "_wt")) else [])
+            + [[InlineKeyboardButton("✔️ Done", callback_data=f"{prefix}_done")]]
+    for prefix in ALERT_MENU_BUTTONS
+}
+
+ALERT_PREFERENCES_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🗓️ Date Posted", callback_data="alert_set_date_posted"), InlineKeyboardButton("🏢 Workplace", callback_data="alert_set_workplace")],
+    [InlineKeyboardButton("🎓 Experience", callback_data="alert_set_experience"), InlineKeyboardButton("📝 Job Types", callback_data="alert_set_job_types")],
+    [InlineKeyboardButton("✅ Save Alert", callback_data="alert_save_final")]
+])
+EDIT_ALERT_PREFERENCES_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🗓️ Date Posted", callback_data="edit_alert_set_date_posted"), InlineKeyboardButton("🏢 Workplace", callback_data="edit_alert_set_workplace")],
+    [InlineKeyboardButton("🎓 Experience", callback_data="edit_alert_set_experience"), InlineKeyboardButton("📝 Job Types", callback_data="edit_alert_set_job_types")],
+    [InlineKeyboardButton("✅ Save Changes", callback_data="edit_alert_save_final")],
+    [InlineKeyboardButton("❌ Cancel", callback_data="my_alerts")]
+])
+# Message templates for the alert screens, filled with str.format_map
+FILTER_SUMMARY_TEMPLATE = (
+    "*Current Filters:*\n"
+    "∙ *Date Posted:* `{date_posted}`\n"
+    "∙ *Workplace:* `{workplace}`\n"
+    "∙ *Experience:* `{experience}`\n"
+    "∙ *Job Types:* `{job_types}`"
+)
+ALERT_PREFERENCES_TEMPLATE = "⚙️ *Alert Filters*\n\n📝 *Keywords:* {keywords}\n📍 *Location:* {location}\n\n" + FILTER_SUMMARY_TEMPLATE
+EDIT_ALERT_PREFERENCES_TEMPLATE = "⚙️ *Edit Alert Preferences*\n\n📝 *Keywords:* {keywords}\n📍 *Location:* {location}\n\n" + FILTER_SUMMARY_TEMPLATE
+ALERT_DETAILS_TEMPLATE = (
+    "🔔 *Alert Details*\n\n"
+    "📝 *Keywords:* {keywords}\n"
+    "📍 *Location:* {location}\n"
+    "📊 *Status:* {status}\n"
+    "📬 *Jobs Sent:* {sent_count}\n\n"
+    + FILTER_SUMMARY_TEMPLATE +
+    "\n\n🕒 Last checked: {last_checked}"
+)
+MY_ALERTS_TEMPLATE = "📋 *Your Alerts* ({count} active)\n\nClick on any alert to manage it:"
+
+def describe_filters(prefs, **fields) -> dict:
+    """Display values for FILTER_SUMMARY_TEMPLATE ("Any" when unset), merged with extra fields."""
+    fields.update(
+        experience=", ".join(prefs['experience'].keys()) or "Any",
+        job_types=", ".join(prefs['job_types'].keys()) or "Any",
+        date_posted=next(iter(prefs['date_posted']), "Any"),
+        workplace=next(iter(prefs['workplace']), "Any"),
+    )
+    return fields
+
+# Static rows shared by the My Alerts screens; only per-alert buttons are built per call
+MY_ALERTS_FOOTER = [
+    [InlineKeyboardButton("➕ Add New Alert", callback_data="add_alert")],
+    [InlineKeyboardButton("🔙 Back to Alerts Menu", callback_data="alerts_menu")]
+]
+NO_ALERTS_KEYBOARD = InlineKeyboardMarkup(MY_ALERTS_FOOTER)
+BACK_TO_ALERTS_ROW = [InlineKeyboardButton("⬅️ Back to Alerts", callback_data="my_alerts")]
+CANCEL_TO_ALERTS_BUTTON = InlineKeyboardButton("No, Cancel", callback_data="my_alerts")
+
+def make_main_menu(context: CallbackContext) -> (str, InlineKeyboardMarkup):
+    return MAIN_MENU_TEXT, MAIN_MENU_KEYBOARD
 
 def make_preferences_menu(context: CallbackContext, chat_id: int) -> (str, InlineKeyboardMarkup):
     prefs = get_user_prefs(context)
     experience = ", ".join(prefs['experience'].keys()) or "Not Set"
     job_types = ", ".join(prefs['job_types'].keys()) or "Not Set"
-    date_posted = list(prefs['date_posted'].keys())[0] if prefs['date_posted'] else "Any"
-    workplace = list(prefs['workplace'].keys())[0] if prefs['workplace'] else "Any"
+    date_posted = next(iter(prefs['date_posted'])) if prefs['date_posted'] else "Any"
+    workplace = next(iter(prefs['workplace'])) if prefs['workplace'] else "Any"
     
     # Get user timezone
-    conn = get_db_connection()
-    tz_row = conn.execute("SELECT timezone FROM user_settings WHERE chat_id = ?", (chat_id,)).fetchone()
-    conn.close()
-    user_timezone = tz_row['timezone'] if tz_row and tz_row['timezone'] else "Not Set (UTC)"
+    user_timezone = get_user_timezone(context, chat_id) or "Not Set (UTC)"
     
     text = (
         "⚙️ *Preferences*\n\n"
@@ -321,32 +790,20 @@ def make_preferences_menu(context: CallbackContext, chat_id: int) -> (str, Inlin
 
 def make_date_posted_menu(context: CallbackContext) -> (str, InlineKeyboardMarkup):
     prefs = get_user_prefs(context)
-    selected_value = list(prefs['date_posted'].values())[0] if prefs['date_posted'] else None
+    selected_value = next(iter(prefs['date_posted'].values())) if prefs['date_posted'] else None
 
     text = "🗓️ Choose Date Posted Filter"
-    keyboard = []
-    for option_text, option_id in DATE_POSTED_OPTIONS.items():
-        is_selected = selected_value == option_id
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"dp_{option_id}_{option_text}")])
-    
-    keyboard.append([InlineKeyboardButton("Clear Filter", callback_data="dp_clear_None")])
-    keyboard.append([InlineKeyboardButton("✔️ Done", callback_data="dp_done")])
+    keyboard = render_option_rows(DATE_POSTED_BUTTONS, lambda option_id: option_id == selected_value)
+    keyboard += DATE_POSTED_FOOTER
     return text, InlineKeyboardMarkup(keyboard)
 
 def make_workplace_menu(context: CallbackContext) -> (str, InlineKeyboardMarkup):
     prefs = get_user_prefs(context)
-    selected_value = list(prefs['workplace'].values())[0] if prefs['workplace'] else None
+    selected_value = next(iter(prefs['workplace'].values())) if prefs['workplace'] else None
 
     text = "🏢 Choose Workplace Type"
-    keyboard = []
-    for option_text, option_id in WORKPLACE_TYPES.items():
-        is_selected = selected_value == option_id
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"wt_{option_id}_{option_text}")])
-    
-    keyboard.append([InlineKeyboardButton("Clear Filter", callback_data="wt_clear_None")])
-    keyboard.append([InlineKeyboardButton("✔️ Done", callback_data="wt_done")])
+    keyboard = render_option_rows(WORKPLACE_BUTTONS, lambda option_id: option_id == selected_value)
+    keyboard += WORKPLACE_FOOTER
     return text, InlineKeyboardMarkup(keyboard)
 
 def make_multi_select_menu(context: CallbackContext, menu_type: str) -> (str, InlineKeyboardMarkup):
@@ -354,12 +811,12 @@ def make_multi_select_menu(context: CallbackContext, menu_type: str) -> (str, In
     
     if menu_type == 'experience':
         title = "🎓 Choose Your Experience Levels"
-        options_dict = EXPERIENCE_LEVELS
+        option_buttons = EXPERIENCE_BUTTONS
         selected_options = prefs['experience']
         callback_prefix = "exp"
     else: # job_type
         title = "📝 Choose Your Job Types"
-        options_dict = JOB_TYPES
+        option_buttons = JOB_TYPE_BUTTONS
         selected_options = prefs['job_types']
         callback_prefix = "jt"
         
@@ -367,12 +824,8 @@ def make_multi_select_menu(context: CallbackContext, menu_type: str) -> (str, In
            "▫️ Click to select/deselect options\n" \
            "▫️ Click 'Done' when finished."
            
-    keyboard = []
-    for option_text, option_id in options_dict.items():
-        is_selected = option_id in selected_options.values()
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"{callback_prefix}_{option_id}_{option_text}")])
-    
+    selected_ids = set(selected_options.values())
+    keyboard = render_option_rows(option_buttons, selected_ids.__contains__)
     keyboard.append([InlineKeyboardButton("✔️ Done", callback_data=f"{callback_prefix}_done")])
     return text, InlineKeyboardMarkup(keyboard)
 
@@ -438,7 +891,7 @@ def show_date_posted_menu(update: Update, context: CallbackContext):
     query = update.callback_query
     query.answer()
     text, keyboard = make_date_posted_menu(context)
-    query.edit_message_text(text, reply_markup=keyboard)
+    edit_menu(query, context, text, keyboard)
     return DATE_POSTED_MENU
 
 def date_posted_selected(update: Update, context: CallbackContext):
@@ -459,18 +912,14 @@ def date_posted_selected(update: Update, context: CallbackContext):
 
     # Re-render the menu to show the change
     text, keyboard = make_date_posted_menu(context)
-    try:
-        query.edit_message_text(text, reply_markup=keyboard)
-    except telegram.error.BadRequest as e:
-        if "message is not modified" not in str(e).lower():
-            raise e
+    edit_menu(query, context, text, keyboard, only_if_changed=True)
     return DATE_POSTED_MENU
 
 def show_workplace_menu(update: Update, context: CallbackContext):
     query = update.callback_query
     query.answer()
     text, keyboard = make_workplace_menu(context)
-    query.edit_message_text(text, reply_markup=keyboard)
+    edit_menu(query, context, text, keyboard)
     return WORKPLACE_MENU
 
 def workplace_selected(update: Update, context: CallbackContext):
@@ -491,11 +940,7 @@ def workplace_selected(update: Update, context: CallbackContext):
 
     # Re-render the menu to show the change
     text, keyboard = make_workplace_menu(context)
-    try:
-        query.edit_message_text(text, reply_markup=keyboard)
-    except telegram.error.BadRequest as e:
-        if "message is not modified" not in str(e).lower():
-            raise e
+    edit_menu(query, context, text, keyboard, only_if_changed=True)
     return WORKPLACE_MENU
 
 def ask_for_preference(update: Update, context: CallbackContext, pref_type: str):
@@ -525,11 +970,7 @@ def show_multi_select_menu(update: Update, context: CallbackContext, menu_type:
     query = update.callback_query
     query.answer()
     text, keyboard = make_multi_select_menu(context, menu_type)
-    try:
-        query.edit_message_text(text, reply_markup=keyboard)
-    except telegram.error.BadRequest as e:
-        if "message is not modified" not in str(e).lower():
-            raise e
+    edit_menu(query, context, text, keyboard)
     return EXPERIENCE_MENU if menu_type == 'experience' else JOB_TYPE_MENU
 
 def toggle_multi_select_option(update: Update, context: CallbackContext, menu_type: str):
@@ -554,24 +995,14 @@ def toggle_multi_select_option(update: Update, context: CallbackContext, menu_ty
         selected_dict[option_text] = option_id
 
     text, keyboard = make_multi_select_menu(context, menu_type)
-    try:
-        query.edit_message_text(text, reply_markup=keyboard)
-    except telegram.error.BadRequest as e:
-        if "message is not modified" not in str(e).lower():
-            raise e
+    edit_menu(query, context, text, keyboard, only_if_changed=True)
     return EXPERIENCE_MENU if menu_type == 'experience' else JOB_TYPE_MENU
 
 
 # --- Scraping Logic ---
-def parse_date_posted(date_str):
-    date_str = date_str.lower().strip()
-    now = datetime.now()
-    if 'hour' in date_str: return now - timedelta(hours=int(re.search(r'\d+', date_str).group()))
-    if 'day' in date_str: return now - timedelta(days=int(re.search(r'\d+', date_str).group()))
-    if 'week' in date_str: return now - timedelta(weeks=int(re.search(r'\d+', date_str).group()))
-    if 'month' in date_str: return now - timedelta(days=30 * int(re.search(r'\d+', date_str).group()))
-    if 'year' in date_str: return now - timedelta(days=365 * int(re.search(r'\d+', date_str).group()))
-    return now
+def sort_jobs_newest_first(jobs):
+    """Order jobs by date posted, newest first (ties keep their scraped order)."""
+    return sorted(jobs, key=lambda job: parse_posted_age(job['Date Posted']))
 
 def create_paginated_job_message(jobs, page):
     start_index = page * JOBS_PER_PAGE
@@ -606,17 +1037,21 @@ def create_paginated_job_message(jobs, page):
     buttons = [row, [InlineKeyboardButton("❌ Close", callback_data="close")]]
     return message_text, InlineKeyboardMarkup(buttons)
 
+# Try multiple selectors for job description
+DESCRIPTION_SELECTORS = [
+    '.show-more-less-html__markup',
+    '.description__text',
+    '[data-automation-id="jobPostingDescription"]',
+    '.jobs-description-content__text'
+]
+
 def get_job_description(job_link):
     """Fetch job description from LinkedIn job page with rate limiting."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.93 Safari/537.36',
-        }
+        # Respect the shared rate limit instead of a fixed sleep per request
+        description_rate.wait()
         
-        # Add delay to avoid rate limiting
-        time.sleep(2)
-        
-        response = requests.get(job_link, headers=headers, timeout=15)
+        response = http_session.get(job_link, timeout=15)
         
         # Handle rate limiting gracefully
         if response.status_code == 429:
@@ -624,17 +1059,20 @@ def get_job_description(job_link):
             return "Description unavailable due to rate limiting"
             
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'lxml')
         
-        # Try multiple selectors for job description
-        description_selectors = [
-            '.show-more-less-html__markup',
-            '.description__text',
-            '[data-automation-id="jobPostingDescription"]',
-            '.jobs-description-content__text'
-        ]
+        if HTMLParser is not None:
+            try:
+                tree = HTMLParser(response.text)
+                for selector in DESCRIPTION_SELECTORS:
+                    desc_elem = tree.css_first(selector)
+                    if desc_elem:
+                        return desc_elem.text(strip=True)[:1000]  # Reduced to 1000 chars
+                return "No description available"
+            except Exception as e:
+                logger.debug(f"selectolax failed on {job_link}, falling back to BeautifulSoup: {e}")
         
-        for selector in description_selectors:
+        soup = BeautifulSoup(response.content, 'lxml')
+        for selector in DESCRIPTION_SELECTORS:
             desc_elem = soup.select_one(selector)
             if desc_elem:
                 return desc_elem.get_text(strip=True)[:1000]  # Reduced to 1000 chars
@@ -644,54 +1082,34 @@ def get_job_description(job_link):
         logger.warning(f"Failed to fetch job description for {job_link}: {e}")
         return "No description available"
 
-def filter_jobs_with_llm(jobs, user_keywords, progress_msg=None):
-    """Use Gemini 1.5 Flash to filter jobs based on relevance to user keywords."""
-    if not jobs or not user_keywords:
-        return jobs
-    
-    # Check if Gemini model is available
-    if not gemini_model:
-        logger.warning("❌ Google AI SDK not configured, skipping LLM filtering - results may include irrelevant jobs")
-        return jobs
-    
-    try:
-        # Increased batch size and optimized processing
-        batch_size = 20  # Increased from 10 to reduce API calls
-        filtered_jobs = []
-        
-        logger.info(f"Starting LLM filtering for {len(jobs)} jobs...")
-        
-        total_batches = (len(jobs) + batch_size - 1) // batch_size
-        
-        for i in range(0, len(jobs), batch_size):
-            batch = jobs[i:i+batch_size]
-            batch_num = i // batch_size + 1
-            
-            # Update progress bar for LLM processing
-            if progress_msg:
-                progress = "🤖" * batch_num
-                progress_empty = "⬜️" * (total_batches - batch_num)
-                progress_text = f"AI Processing...\nBatch {batch_num}/{total_batches}\n[{progress}{progress_empty}]"
-                try:
-                    progress_msg.edit_text(text=progress_text)
-                except telegram.error.BadRequest as e:
-                    if 'not modified' not in str(e).lower():
-                        logger.warning(f"Progress bar update failed: {e}")
-            
-            try:
-                # Prepare job data for LLM - include title, company, and location for better context
-                job_summaries = []
-                for idx, job in enumerate(batch):
-                    # Include more context for better matching
-                    job_summaries.append(f"{idx}: {job['Title']} at {job['Company']} ({job['Location']})")
-                
-                prompt = f"""You are a job title screener. Your job is to check if a job title matches a user's search query based on a strict set of rules.
+def get_cached_llm_decisions(keywords_canon):
+    """Return {canonical_title: relevant} for every unexpired cached LLM decision under these keywords."""
+    rows = get_db_connection().execute(
+        "SELECT title_canon, relevant FROM llm_cache WHERE keywords_canon = ? AND decided_at >= ?",
+        (keywords_canon, int(time.time()) - LLM_CACHE_TTL)
+    ).fetchall()
+    return {row['title_canon']: bool(row['relevant']) for row in rows}
+
+def save_llm_decisions(decisions):
+    """Persist (keywords_canon, title_canon, relevant) tuples to the LLM decision cache."""
+    if not decisions:
+        return
+    now = int(time.time())
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT OR REPLACE INTO llm_cache (keywords_canon, title_canon, relevant, decided_at) VALUES (?, ?, ?, ?)",
+        [decision + (now,) for decision in decisions]
+    )
+    conn.commit()
+
+# Static instructions for the relevance filter; only the query and job list vary per batch
+LLM_PROMPT_TEMPLATE = """You are a job title screener. Your job is to check if a job title matches a user's search query based on a strict set of rules.
 
-**User's Search Query**: "{user_keywords}"
+**User's Search Query**: "{kw}"
 
 **Rules of Analysis:**
 
-1.  **Identify Core Keywords**: Break down the user's query into essential parts. For "{user_keywords}", the core concepts must be identified (e.g., "Working Student" and "AI").
+1.  **Identify Core Keywords**: Break down the user's query into essential parts. For "{kw}", the core concepts must be identified (e.g., "Working Student" and "AI").
 
 2.  **Strict Keyword Matching**: The job title **MUST** contain keywords related to **ALL** the core concepts from the user's query.
     - It is not enough for just one part to match. A partial match is a failure.
@@ -709,7 +1127,7 @@ def filter_jobs_with_llm(jobs, user_keywords, progress_msg=None):
 
 ---
 **Job List to Analyze**:
-{chr(10).join(job_summaries)}
+{jobs}
 
 ---
 **Output Instructions**:
@@ -720,59 +1138,231 @@ Example: `none`
 
 Numbers only:"""
 
-                generation_config = genai.types.GenerationConfig(
-                    candidate_count=1,
-                    max_output_tokens=50,
-                    temperature=0.1,
-                )
-                response = gemini_model.generate_content(
+def is_rate_limit_error(error):
+    """True when a Gemini error is a 429 quota (rate-limit) response, the only case worth backing off for."""
+    text = str(error).lower()
+    return "429" in text and "quota" in text
+
+def generate_llm_response(prompt):
+    """Call Gemini, backing off exponentially (with jitter) while it reports rate limiting."""
+    for attempt in range(LLM_RATE_LIMIT_RETRIES + 1):
+        gemini_cooldown.wait()
+        try:
+            with gemini_slots:
+                return gemini_model.generate_content(
                     prompt,
-                    generation_config=generation_config,
+                    generation_config=LLM_GENERATION_CONFIG,
                     # Add a timeout if the SDK supports it, or handle it in the calling code
                 )
-                
-                result = response.text.strip().lower()
-                logger.info(f"🤖 LLM response for batch {i//batch_size + 1}: '{result}'")
-                
-                if result != "none":
-                    try:
-                        # Parse the returned job numbers
-                        job_numbers = [int(x.strip()) for x in result.split(',') if x.strip().isdigit()]
-                        logger.info(f"📊 Selected job indices: {job_numbers} out of {len(batch)} jobs")
-                        for job_num in job_numbers:
-                            if 0 <= job_num < len(batch):
-                                # Only fetch description for selected jobs to save time
-                                selected_job = batch[job_num]
-                                filtered_jobs.append(selected_job)
-                                logger.debug(f"✅ Included: {selected_job['Title']} at {selected_job['Company']}")
-                    except ValueError:
-                        # If parsing fails, include all jobs from this batch
-                        logger.warning(f"❌ Failed to parse LLM response: '{result}' - including all jobs from batch")
-                        filtered_jobs.extend(batch)
-                else:
-                    logger.info(f"🚫 LLM returned 'none' - no relevant jobs in this batch")
-                
+        except Exception as e:
+            if attempt == LLM_RATE_LIMIT_RETRIES or not is_rate_limit_error(e):
+                raise
+            delay = min(LLM_MAX_BACKOFF, 2 ** attempt + random.random())
+            logger.warning(f"⏳ Gemini rate limited, backing off {delay:.1f}s (retry {attempt + 1}/{LLM_RATE_LIMIT_RETRIES})")
+            gemini_cooldown.extend(delay)
+
+def _filter_batch_with_llm(batch, user_keywords, batch_num):
+    """Ask Gemini which jobs in a single batch are relevant.
+
+    Returns (selected_jobs, decided); decided is False when the response could not be
+    parsed and the whole batch was kept as a fallback.
+    """
+    # One compact line per job keeps the prompt small so large batches stay cheap
+    job_summaries = "\n".join(f"{idx}:{job['Title']} @ {job['Company']}" for idx, job in enumerate(batch))
+    prompt = LLM_PROMPT_TEMPLATE.format(kw=user_keywords, jobs=job_summaries)
+
+    # A second attempt is made only when the first answer cannot be parsed
+    for attempt in range(2):
+        response = generate_llm_response(prompt)
+        
+        result = response.text.strip().lower()
+        logger.info(f"🤖 LLM response for batch {batch_num}: '{result}'")
+        usage = getattr(response, 'usage_metadata', None)
+        if usage and usage.prompt_token_count:
+            logger.info(f"📐 Batch {batch_num}: {len(batch)} jobs in {usage.prompt_token_count} prompt tokens "
+                        f"(η={len(batch) / usage.prompt_token_count:.3f} jobs/token)")
+        
+        # Parse the returned job numbers in one pass
+        job_numbers = [int(x) for x in _DIGITS_RE.findall(result)]
+        if job_numbers:
+            break
+        # "none", "none." etc. is a real answer: nothing in this batch is relevant
+        if _NONE_RE.search(result):
+            logger.info(f"🚫 LLM returned 'none' - no relevant jobs in this batch")
+            return [], True
+        logger.warning(f"❌ Failed to parse LLM response for batch {batch_num} (attempt {attempt + 1}): '{result}'")
+    else:
+        # Neither job numbers nor "none" after a re-ask: keep the whole batch rather than guess
+        logger.warning(f"❌ Giving up on parsing batch {batch_num} - including all jobs from batch")
+        return list(batch), False
+    
+    logger.info(f"📊 Selected job indices: {job_numbers} out of {len(batch)} jobs")
+    selected_jobs = [batch[job_num] for job_num in job_numbers if 0 <= job_num < len(batch)]
+    for selected_job in selected_jobs:
+        logger.debug(f"✅ Included: {selected_job['Title']} at {selected_job['Company']}")
+    return selected_jobs, True
+
+def filter_jobs_with_llm(jobs, user_keywords, progress_msg=None):
+    """Use Gemini 1.5 Flash to filter jobs based on relevance to user keywords.
+
+    The relevant jobs are returned in their input order, so a sorted input stays sorted.
+    """
+    if not jobs or not user_keywords:
+        return jobs
+    
+    # Check if Gemini model is available
+    if not gemini_model:
+        logger.warning("❌ Google AI SDK not configured, skipping LLM filtering - results may include irrelevant jobs")
+        return jobs
+    
+    try:
+        # Answer previously seen titles from the decision cache; only unknown ones go to Gemini
+        keywords_canon = canonical_text(user_keywords)
+        cached_decisions = get_cached_llm_decisions(keywords_canon)
+        cached_jobs = []
+        uncached_jobs = []
+        for job in jobs:
+            relevant = cached_decisions.get(canonical_text(job['Title']))
+            if relevant is None:
+                uncached_jobs.append(job)
+            elif relevant:
+                cached_jobs.append(job)
+        
+        batch_size = LLM_BATCH_SIZE
+        batches = [uncached_jobs[i:i+batch_size] for i in range(0, len(uncached_jobs), batch_size)]
+        total_batches = len(batches)
+        batch_results = [[] for _ in batches]
+        new_decisions = []
+        
+        logger.info(f"Starting LLM filtering for {len(uncached_jobs)} jobs ({len(jobs) - len(uncached_jobs)} answered from cache)...")
+        
+        def completed_batches():
+            """Yield (idx, get_result) as batches finish; a lone batch runs inline without a pool."""
+            if total_batches == 1:
+                yield 0, lambda: _filter_batch_with_llm(batches[0], user_keywords, 1)
+                return
+            # Batches are independent network calls, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=LLM_MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(_filter_batch_with_llm, batch, user_keywords, idx + 1): idx
+                    for idx, batch in enumerate(batches)
+                }
+                for future in as_completed(futures):
+                    yield futures[future], future.result
+        
+        for completed, (idx, get_result) in enumerate(completed_batches(), 1):
+            try:
+                selected, decided = get_result()
+                batch_results[idx] = selected
+                if decided:
+                    selected_ids = {id(job) for job in selected}
+                    new_decisions.extend(
+                        (keywords_canon, canonical_text(job['Title']), int(id(job) in selected_ids))
+                        for job in batches[idx]
+                    )
             except Exception as batch_error:
                 # Check for rate limit error specifically
-                if "429" in str(batch_error) and "quota" in str(batch_error).lower():
-                    logger.error(f"RATE LIMIT on batch {i//batch_size + 1}. Skipping remaining batches for this search/alert to avoid irrelevant results.")
-                    break
+                if is_rate_limit_error(batch_error):
+                    logger.error(f"RATE LIMIT on batch {idx + 1} after {LLM_RATE_LIMIT_RETRIES} retries. Dropping this batch to avoid irrelevant results.")
                 else:
-                    logger.warning(f"LLM batch {i//batch_size + 1} failed, including all jobs from batch. Error: {batch_error}")
-                    filtered_jobs.extend(batch)
+                    logger.warning(f"LLM batch {idx + 1} failed, including all jobs from batch. Error: {batch_error}")
+                    batch_results[idx] = batches[idx]
             
-            # Reduced rate limiting since we're making fewer calls
-            time.sleep(0.5)
+            # Update progress bar for LLM processing
+            if progress_msg:
+                progress = "🤖" * completed
+                progress_empty = "⬜️" * (total_batches - completed)
+                progress_text = f"AI Processing...\nBatch {completed}/{total_batches}\n[{progress}{progress_empty}]"
+                try:
+                    progress_msg.edit_text(text=progress_text)
+                except telegram.error.BadRequest as e:
+                    if not is_not_modified(e):
+                        logger.warning(f"Progress bar update failed: {e}")
         
-        logger.info(f"LLM filtered {len(jobs)} jobs down to {len(filtered_jobs)} relevant jobs")
+        save_llm_decisions(new_decisions)
         
-        # Re-sort filtered jobs by date posted (newest first) since LLM filtering disrupts original order
-        return sorted(filtered_jobs, key=lambda job: parse_date_posted(job['Date Posted']), reverse=True)
+        # Select by identity from the input list, which keeps its order without re-sorting
+        relevant_ids = {id(job) for job in cached_jobs}
+        relevant_ids.update(id(job) for selected in batch_results for job in selected)
+        filtered_jobs = [job for job in jobs if id(job) in relevant_ids]
+        
+        logger.info(f"LLM filtered {len(jobs)} jobs down to {len(filtered_jobs)} relevant jobs")
+        return filtered_jobs
         
     except Exception as e:
         logger.error(f"LLM filtering failed completely: {e}")
-        # Return original jobs if LLM fails, but ensure they're sorted by date
-        return sorted(jobs, key=lambda job: parse_date_posted(job['Date Posted']), reverse=True)
+        # Return original jobs if LLM fails
+        return jobs
+
+def iter_job_cards(content):
+    """Yield job dicts parsed from a LinkedIn search results page, skipping malformed cards.
+
+    Uses selectolax when installed (a C parser, several times faster than BeautifulSoup here)
+    and falls back to BeautifulSoup/lxml otherwise. Cards are yielded as they are parsed so
+    callers can dedup them straight away without building an intermediate list.
+    """
+    if HTMLParser is not None:
+        for card in HTMLParser(content).css('div.base-card'):
+            try:
+                raw_link = card.css_first('a.base-card__full-link').attributes['href']
+                job = {
+                    'Title': card.css_first('h3.base-search-card__title').text().strip(),
+                    'Company': card.css_first('h4.base-search-card__subtitle').text().strip(),
+                    'Location': card.css_first('span.job-search-card__location').text().strip(),
+                    'Date Posted': (card.css_first('time.job-search-card__listdate') or card.css_first('time')).text().strip(),
+                    'Link': raw_link.split('?')[0]
+                }
+            except (AttributeError, TypeError, KeyError):
+                continue
+            yield job
+        return
+
+    soup = BeautifulSoup(content, 'lxml')
+    for card in soup.find_all('div', class_='base-card'):
+        try:
+            raw_link = card.find('a', class_='base-card__full-link')['href']
+            job = {
+                'Title': card.find('h3', class_='base-search-card__title').text.strip(),
+                'Company': card.find('h4', class_='base-search-card__subtitle').text.strip(),
+                'Location': card.find('span', class_='job-search-card__location').text.strip(),
+                'Date Posted': (card.find('time', class_='job-search-card__listdate') or card.find('time')).text.strip(),
+                'Link': raw_link.split('?')[0]
+            }
+        except (AttributeError, TypeError):
+            continue
+        yield job
+
+def build_scrape_filters(prefs):
+    """LinkedIn filter parameters (f_E, f_JT, f_TPR, f_WT) for a preferences dict."""
+    return {
+        'f_E': ",".join(prefs['experience'].values()),
+        'f_JT': ",".join(prefs['job_types'].values()),
+        'f_TPR': next(iter(prefs['date_posted'].values()), None),
+        'f_WT': next(iter(prefs['workplace'].values()), None)
+    }
+
+ALERT_FILTER_COLUMNS = ('f_E', 'f_JT', 'f_TPR', 'f_WT')
+
+def alert_filter_values(prefs):
+    """build_scrape_filters as a tuple in ALERT_FILTER_COLUMNS order, for the alerts table."""
+    filters = build_scrape_filters(prefs)
+    return tuple(filters[col] for col in ALERT_FILTER_COLUMNS)
+
+def build_search_params(keyword, location, filters_dict):
+    """Query parameters shared by every page of one search; requests handles the URL encoding."""
+    params = {'keywords': keyword, 'location': location}
+    params.update((key, value) for key, value in filters_dict.items() if value)
+    return params
+
+def get_search_page(params, pace):
+    """Fetches one search results page, calling pace() only when the page is not already cached."""
+    if CachedSession is not None:
+        response = http_session.get(LINKEDIN_SEARCH_URL, params=params, only_if_cached=True, timeout=10)
+        # A miss comes back as a synthetic 504 that also reports from_cache, so check the status too
+        if response.status_code == 200 and response.from_cache:
+            return response
+    pace()
+    return http_session.get(LINKEDIN_SEARCH_URL, params=params, timeout=10)
 
 def scrape_linkedin(keyword, location, filters_dict, max_pages=None):
     """Reusable and DYNAMIC scraping function.
@@ -781,15 +1371,7 @@ def scrape_linkedin(keyword, location, filters_dict, max_pages=None):
     """
     all_jobs_data = []
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.93 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
-        'Connection': 'keep-alive',
-    }
-    
-    filter_params = "".join([f"&{key}={quote_plus(value)}" for key, value in filters_dict.items() if value])
+    search_params = build_search_params(keyword, location, filters_dict)
     
     page_number = 0
     while True:
@@ -798,33 +1380,18 @@ def scrape_linkedin(keyword, location, filters_dict, max_pages=None):
             break
 
         start_index = page_number * 25
-        url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={quote_plus(keyword)}&location={quote_plus(location)}&start={start_index}{filter_params}"
         
         try:
-            time.sleep(1.5) # Be respectful to LinkedIn's servers
-            response = requests.get(url, headers=headers, timeout=10)
+            # Be respectful to LinkedIn's servers
+            response = get_search_page({**search_params, 'start': start_index}, pace=lambda: time.sleep(1.5))
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
-            job_cards = soup.find_all('div', class_='base-card')
+            page_jobs = list(iter_job_cards(response.content))
 
-            if not job_cards:
+            if not page_jobs:
                 logger.info(f"No more job cards found on page {page_number}. Stopping scrape.")
                 break 
 
-            for job in job_cards:
-                try:
-                    raw_link = job.find('a', class_='base-card__full-link')['href']
-                    clean_link = raw_link.split('?')[0]
-                    all_jobs_data.append({
-                        'Title': job.find('h3', class_='base-search-card__title').text.strip(),
-                        'Company': job.find('h4', class_='base-search-card__subtitle').text.strip(),
-                        'Location': job.find('span', class_='job-search-card__location').text.strip(),
-                        'Date Posted': (job.find('time', class_='job-search-card__listdate') or job.find('time')).text.strip(),
-                        'Link': clean_link
-                    })
-                except (AttributeError, TypeError):
-                    continue
-            
+            all_jobs_data.extend(page_jobs)
             page_number += 1
             
         except requests.exceptions.HTTPError as e:
@@ -832,99 +1399,94 @@ def scrape_linkedin(keyword, location, filters_dict, max_pages=None):
                 logger.info(f"LinkedIn pagination limit reached at start={start_index}. Stopping scrape.")
                 break  # Break the loop and return what we have so far
             else:
-                logger.error(f"HTTP error for url {url}: {e}")
+                logger.error(f"HTTP error for page {page_number + 1} (start={start_index}): {e}")
                 break
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed for url {url}: {e}")
+            logger.error(f"Request failed for page {page_number + 1} (start={start_index}): {e}")
             break  # Break instead of returning empty, so we keep existing jobs
 
-    return sorted(all_jobs_data, key=lambda job: parse_date_posted(job['Date Posted']), reverse=True)
+    return sort_jobs_newest_first(all_jobs_data)
 
 def scrape_linkedin_with_llm_filter(keyword, location, filters_dict, max_pages=None, progress_msg=None):
     """Scrapes all jobs from LinkedIn first, then applies a single LLM filter pass to reduce API calls."""
     all_scraped_jobs = []
-    seen_job_ids = set()
-    seen_canonical_pairs = set()
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.93 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
-        'Connection': 'keep-alive',
-    }
+    seen_keys = set()  # Job IDs (str) and (title, company) pairs (tuple) of every job kept so far
     
-    filter_params = "".join([f"&{key}={quote_plus(value)}" for key, value in filters_dict.items() if value])
+    search_params = build_search_params(keyword, location, filters_dict)
     
-    page_number = 0
+    def fetch_page(start_index):
+        with linkedin_slots:
+            # Be respectful to LinkedIn's servers
+            response = get_search_page({**search_params, 'start': start_index}, pace=search_page_rate.wait)
+        response.raise_for_status()
+        return response.content
     
     # --- Step 1: Scrape all pages first ---
-    while True:
-        if max_pages and page_number >= max_pages:
-            logger.info(f"Reached max_pages limit of {max_pages}. Stopping scrape.")
-            break
-
-        start_index = page_number * 25
-        url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={quote_plus(keyword)}&location={quote_plus(location)}&start={start_index}{filter_params}"
-        
-        # Update progress message for scraping phase
-        if progress_msg:
-            try:
-                progress_msg.edit_text(text=f"🔍 Scraping page {page_number + 1}... (Found {len(all_scraped_jobs)} jobs so far)")
-            except:
-                pass
-        
-        try:
-            time.sleep(1.5)  # Be respectful to LinkedIn's servers
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
-            job_cards = soup.find_all('div', class_='base-card')
-
-            if not job_cards:
-                logger.info(f"No more job cards found on page {page_number + 1}. Stopping scrape.")
-                break 
-
-            # Extract jobs from current page
-            for job in job_cards:
+    # Pages are fetched in waves of SCRAPE_CONCURRENCY and processed in order. LinkedIn signals the
+    # end with a 400 or an empty page, so a wave may fetch a few pages past the end; those are discarded.
+    page_number = 0
+    finished = False
+    with ThreadPoolExecutor(max_workers=SCRAPE_CONCURRENCY) as executor:
+        while not finished:
+            wave_end = page_number + SCRAPE_CONCURRENCY
+            if max_pages:
+                wave_end = min(wave_end, max_pages)
+            if page_number >= wave_end:
+                logger.info(f"Reached max_pages limit of {max_pages}. Stopping scrape.")
+                break
+            
+            futures = [(n, executor.submit(fetch_page, n * 25)) for n in range(page_number, wave_end)]
+            for n, future in futures:
+                start_index = n * 25
+                
+                # Update progress message for scraping phase
+                if progress_msg:
+                    try:
+                        progress_msg.edit_text(text=f"🔍 Scraping page {n + 1}... (Found {len(all_scraped_jobs)} jobs so far)")
+                    except:
+                        pass
+                
                 try:
-                    raw_link = job.find('a', class_='base-card__full-link')['href']
-                    clean_link = raw_link.split('?')[0]
-                    job_data = {
-                        'Title': job.find('h3', class_='base-search-card__title').text.strip(),
-                        'Company': job.find('h4', class_='base-search-card__subtitle').text.strip(),
-                        'Location': job.find('span', class_='job-search-card__location').text.strip(),
-                        'Date Posted': (job.find('time', class_='job-search-card__listdate') or job.find('time')).text.strip(),
-                        'Link': clean_link
-                    }
-                    
-                    # Check for duplicates before adding
+                    content = future.result()
+                except requests.exceptions.HTTPError as e:
+                    if e.response.status_code == 400:
+                        logger.info(f"LinkedIn pagination limit reached at start={start_index}. Stopping scrape.")
+                    else:
+                        logger.error(f"HTTP error for page {n + 1}: {e}")
+                    finished = True
+                    break
+                except requests.exceptions.RequestException as e:
+                    logger.error(f"Request failed for page {n + 1}: {e}")
+                    finished = True
+                    break
+                
+                # Extract jobs from current page, deduplicating each card as it is parsed
+                jobs_before_page = len(all_scraped_jobs)
+                cards_on_page = 0
+                for job_data in iter_job_cards(content):
+                    cards_on_page += 1
+                    # Check for duplicates before adding; the cheap link check runs first so
+                    # repeated cards never pay for title/company canonicalization. Cards without
+                    # a link are deduplicated on title/company alone.
                     job_id = canonical_link(job_data['Link'])
-                    canonical_title = canonical_text(job_data['Title'])
-                    canonical_company = canonical_text(job_data['Company'])
-                    canonical_pair = (canonical_title, canonical_company)
+                    if job_id in seen_keys:
+                        continue
+                    canonical_pair = (canonical_text(job_data['Title']), canonical_text(job_data['Company']))
+                    if canonical_pair in seen_keys:
+                        continue
                     
-                    if job_id not in seen_job_ids and canonical_pair not in seen_canonical_pairs:
-                        seen_job_ids.add(job_id)
-                        seen_canonical_pairs.add(canonical_pair)
-                        all_scraped_jobs.append(job_data)
-                        
-                except (AttributeError, TypeError):
-                    continue
-            
-            logger.info(f"📄 Page {page_number + 1}: scraped {len(all_scraped_jobs) - len(seen_job_ids)} new jobs (total unique: {len(all_scraped_jobs)})")
-            page_number += 1
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 400:
-                logger.info(f"LinkedIn pagination limit reached at start={start_index}. Stopping scrape.")
-                break
-            else:
-                logger.error(f"HTTP error for url {url}: {e}")
-                break
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed for url {url}: {e}")
-            break
+                    if job_id:
+                        seen_keys.add(job_id)
+                    seen_keys.add(canonical_pair)
+                    all_scraped_jobs.append(job_data)
+                
+                if not cards_on_page:
+                    logger.info(f"No more job cards found on page {n + 1}. Stopping scrape.")
+                    finished = True
+                    break
+                
+                logger.info(f"📄 Page {n + 1}: scraped {len(all_scraped_jobs) - jobs_before_page} new jobs (total unique: {len(all_scraped_jobs)})")
+                page_number = n + 1
 
     logger.info(f"🏁 Scraping complete: {len(all_scraped_jobs)} total jobs found.")
     
@@ -932,6 +1494,9 @@ def scrape_linkedin_with_llm_filter(keyword, location, filters_dict, max_pages=N
     if not all_scraped_jobs:
         return []
 
+    # Sort once, newest first; LLM filtering preserves the order
+    all_scraped_jobs = sort_jobs_newest_first(all_scraped_jobs)
+    
     all_filtered_jobs = []
     if gemini_model:
         logger.info(f"🤖 Applying LLM filtering to all {len(all_scraped_jobs)} jobs...")
@@ -941,9 +1506,7 @@ def scrape_linkedin_with_llm_filter(keyword, location, filters_dict, max_pages=N
         all_filtered_jobs = all_scraped_jobs
     
     logger.info(f"🎯 Filtering complete: {len(all_scraped_jobs)} → {len(all_filtered_jobs)} relevant jobs")
-    
-    # Sort by date posted (newest first)
-    return sorted(all_filtered_jobs, key=lambda job: parse_date_posted(job['Date Posted']), reverse=True)
+    return all_filtered_jobs
 
 def run_scrape(update: Update, context: CallbackContext, progress_msg):
     chat_id = update.message.chat_id
@@ -953,18 +1516,13 @@ def run_scrape(update: Update, context: CallbackContext, progress_msg):
     search_location = context.user_data.get('search_location')
     prefs = get_user_prefs(context)
 
-    filters = {
-        'f_E': ",".join(prefs['experience'].values()),
-        'f_JT': ",".join(prefs['job_types'].values()),
-        'f_TPR': list(prefs['date_posted'].values())[0] if prefs['date_posted'] else None,
-        'f_WT': list(prefs['workplace'].values())[0] if prefs['workplace'] else None
-    }
+    filters = build_scrape_filters(prefs)
     
     # Show scraping message (no progress bar)
     try:
         progress_msg.edit_text(text="🔍 Scraping LinkedIn jobs...")
     except telegram.error.BadRequest as e:
-        if 'not modified' not in str(e).lower():
+        if not is_not_modified(e):
             logger.warning(f"Progress message update failed: {e}")
 
     # Scrape jobs with LLM filtering (progress bar will show during LLM processing)
@@ -972,14 +1530,12 @@ def run_scrape(update: Update, context: CallbackContext, progress_msg):
 
     if not sorted_jobs:
         progress_msg.edit_text(text="Search complete. No jobs found with these criteria.")
-        time.sleep(2)
         # Go back to main menu after a delay
         text, kbd = make_main_menu(context)
-        progress_msg.edit_text(text, reply_markup=kbd)
+        show_menu_later(context, progress_msg, text, kbd, delay=2)
         return MAIN_MENU
         
     progress_msg.edit_text(text=f"✅ Found {len(sorted_jobs)} relevant jobs!")
-    time.sleep(1)
     context.user_data['jobs'] = sorted_jobs
     context.user_data['page'] = 0
     message_text, reply_markup = create_paginated_job_message(sorted_jobs, 0)
@@ -1002,6 +1558,13 @@ def ignore_callback(update: Update, context: CallbackContext):
     """An empty callback function to handle unclickable buttons."""
     safe_answer_callback_query(update.callback_query)
 
+def still_working(update: Update, context: CallbackContext):
+    """Acknowledge a click that arrives while a run_async handler of this conversation is still running."""
+    try:
+        update.callback_query.answer("⏳ Still working, one moment…")
+    except (telegram.error.TimedOut, telegram.error.BadRequest):
+        pass
+
 def close_browsing(update: Update, context: CallbackContext):
     query = update.callback_query
     safe_answer_callback_query(query)
@@ -1080,39 +1643,29 @@ def alert_skip_filters(update: Update, context: CallbackContext):
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
-        "INSERT INTO alerts (chat_id, keywords, location, filters) VALUES (?, ?, ?, ?)",
-        (chat_id, keywords, location, filters_json)
+        "INSERT INTO alerts (chat_id, keywords, location, filters, f_E, f_JT, f_TPR, f_WT) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (chat_id, keywords, location, filters_json, *alert_filter_values(empty_prefs))
     )
     alert_id = cursor.lastrowid
     conn.commit()
+    invalidate_alert_list_cache(chat_id)
     
     # Populate baseline jobs to avoid spam (no filters)
-    filter_dict = {'f_E': '', 'f_JT': '', 'f_TPR': None, 'f_WT': None}
+    filter_dict = build_scrape_filters(empty_prefs)
     
     try:
         baseline_jobs = scrape_linkedin_with_llm_filter(keywords, location, filter_dict, progress_msg=None)
-        for job in baseline_jobs:
-            job_id = canonical_link(job['Link'])
-            canonical_title = canonical_text(job['Title'])
-            canonical_company = canonical_text(job['Company'])
-            cursor.execute("""
-                INSERT OR IGNORE INTO sent_jobs 
-                (alert_id, chat_id, job_link, job_id, job_title, company, canonical_title, canonical_company) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (alert_id, chat_id, job['Link'], job_id, job['Title'], job['Company'], canonical_title, canonical_company))
-        conn.commit()
+        record_sent_jobs(conn, alert_id, chat_id, baseline_jobs)
         logger.info(f"Populated {len(baseline_jobs)} baseline jobs for new alert ID {alert_id}")
     except Exception as e:
         logger.error(f"Failed to populate baseline jobs: {e}")
-    
-    conn.close()
+    invalidate_sent_jobs_cache(chat_id)
     
     query.edit_message_text(f"✅ Alert for '{keywords}' in '{location}' has been set with no filters and is now active. I've recorded {len(baseline_jobs) if 'baseline_jobs' in locals() else 0} existing jobs so you'll only get notified about truly new opportunities!")
     
     # Go back to the main menu after a delay
-    time.sleep(3)
     text, keyboard = make_main_menu(context)
-    query.edit_message_text(text, reply_markup=keyboard)
+    show_menu_later(context, query.message, text, keyboard, delay=3)
     return MAIN_MENU
 
 def alert_set_filters(update: Update, context: CallbackContext):
@@ -1146,30 +1699,12 @@ def get_alert_prefs(context: CallbackContext) -> dict:
 def make_alert_preferences_menu(context: CallbackContext) -> (str, InlineKeyboardMarkup):
     """Create the alert preferences menu."""
     prefs = get_alert_prefs(context)
-    keywords = context.user_data.get('alert_keywords', 'N/A')
-    location = context.user_data.get('alert_location', 'N/A')
-    
-    experience = ", ".join(prefs['experience'].keys()) or "Any"
-    job_types = ", ".join(prefs['job_types'].keys()) or "Any"
-    date_posted = list(prefs['date_posted'].keys())[0] if prefs['date_posted'] else "Any"
-    workplace = list(prefs['workplace'].keys())[0] if prefs['workplace'] else "Any"
-    
-    text = (
-        f"⚙️ *Alert Filters*\n\n"
-        f"📝 *Keywords:* {keywords}\n"
-        f"📍 *Location:* {location}\n\n"
-        f"*Current Filters:*\n"
-        f"∙ *Date Posted:* `{date_posted}`\n"
-        f"∙ *Workplace:* `{workplace}`\n"
-        f"∙ *Experience:* `{experience}`\n"
-        f"∙ *Job Types:* `{job_types}`"
-    )
-    keyboard = [
-        [InlineKeyboardButton("🗓️ Date Posted", callback_data="alert_set_date_posted"), InlineKeyboardButton("🏢 Workplace", callback_data="alert_set_workplace")],
-        [InlineKeyboardButton("🎓 Experience", callback_data="alert_set_experience"), InlineKeyboardButton("📝 Job Types", callback_data="alert_set_job_types")],
-        [InlineKeyboardButton("✅ Save Alert", callback_data="alert_save_final")]
-    ]
-    return text, InlineKeyboardMarkup(keyboard)
+    text = ALERT_PREFERENCES_TEMPLATE.format_map(describe_filters(
+        prefs,
+        keywords=context.user_data.get('alert_keywords', 'N/A'),
+        location=context.user_data.get('alert_location', 'N/A'),
+    ))
+    return text, ALERT_PREFERENCES_KEYBOARD
 
 def alert_save_final(update: Update, context: CallbackContext):
     """Save the alert with the configured preferences and populate baseline jobs."""
@@ -1188,38 +1723,23 @@ def alert_save_final(update: Update, context: CallbackContext):
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
-        "INSERT INTO alerts (chat_id, keywords, location, filters) VALUES (?, ?, ?, ?)",
-        (chat_id, keywords, location, filters_json)
+        "INSERT INTO alerts (chat_id, keywords, location, filters, f_E, f_JT, f_TPR, f_WT) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (chat_id, keywords, location, filters_json, *alert_filter_values(prefs))
     )
     alert_id = cursor.lastrowid
     conn.commit()
+    invalidate_alert_list_cache(chat_id)
     
     # Populate baseline jobs to avoid spam
-    filter_dict = {
-        'f_E': ",".join(prefs['experience'].values()),
-        'f_JT': ",".join(prefs['job_types'].values()),
-        'f_TPR': list(prefs['date_posted'].values())[0] if prefs['date_posted'] else None,
-        'f_WT': list(prefs['workplace'].values())[0] if prefs['workplace'] else None
-    }
+    filter_dict = build_scrape_filters(prefs)
     
     try:
         baseline_jobs = scrape_linkedin_with_llm_filter(keywords, location, filter_dict, progress_msg=None)
-        for job in baseline_jobs:
-            job_id = canonical_link(job['Link'])
-            canonical_title = canonical_text(job['Title'])
-            canonical_company = canonical_text(job['Company'])
-            cursor.execute("""
-                INSERT OR IGNORE INTO sent_jobs 
-                (alert_id, chat_id, job_link, job_id, job_title, company, canonical_title, canonical_company) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (alert_id, chat_id, job['Link'], job_id, job['Title'], job['Company'], canonical_title, canonical_company))
-            conn.commit()
-            time.sleep(1.2)  # Rate limit: max 20 messages per 30 seconds per chat
+        record_sent_jobs(conn, alert_id, chat_id, baseline_jobs)
         logger.info(f"Populated {len(baseline_jobs)} baseline jobs for new alert ID {alert_id}")
     except Exception as e:
         logger.error(f"Failed to populate baseline jobs: {e}")
-    
-    conn.close()
+    invalidate_sent_jobs_cache(chat_id)
     
     # Clean up alert-specific data
     context.user_data.pop('alert_keywords', None)
@@ -1229,49 +1749,44 @@ def alert_save_final(update: Update, context: CallbackContext):
     query.edit_message_text(f"✅ Alert for '{keywords}' in '{location}' has been set with your custom filters and is now active. I've recorded {len(baseline_jobs) if 'baseline_jobs' in locals() else 0} existing jobs so you'll only get notified about truly new opportunities!")
     
     # Go back to the main menu after a delay
-    time.sleep(3)
     text, keyboard = make_main_menu(context)
-    query.edit_message_text(text, reply_markup=keyboard)
+    show_menu_later(context, query.message, text, keyboard, delay=3)
     return MAIN_MENU
 
-# Alert-specific preference handlers (similar to global ones but use alert_preferences)
-def show_alert_date_posted_menu(update: Update, context: CallbackContext):
+# Alert-specific preference handlers (similar to global ones but use alert_preferences).
+# The single-select menus are shared by the alert and edit-alert flows: the callback prefix
+# ("alert_dp", "edit_alert_wt", ...) picks the prefs field, the title and the state to return.
+SINGLE_SELECT_MENUS = {
+    "dp": ("date_posted", "🗓️ Choose Date Posted Filter for This Alert"),
+    "wt": ("workplace", "🏢 Choose Workplace Type for This Alert"),
+}
+SINGLE_SELECT_CALLBACK_RE = re.compile(r"^((?:edit_)?alert_(dp|wt))_([^_]+)_(.*)$")
+
+def show_alert_single_select_menu(update: Update, context: CallbackContext, prefix: str):
     query = update.callback_query
     query.answer()
-    
-    prefs = get_alert_prefs(context)
-    selected_value = list(prefs['date_posted'].values())[0] if prefs['date_posted'] else None
 
-    text = "🗓️ Choose Date Posted Filter for This Alert"
-    keyboard = []
-    for option_text, option_id in DATE_POSTED_OPTIONS.items():
-        is_selected = selected_value == option_id
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"alert_dp_{option_id}_{option_text}")])
-    
-    keyboard.append([InlineKeyboardButton("Clear Filter", callback_data="alert_dp_clear_None")])
-    keyboard.append([InlineKeyboardButton("✔️ Done", callback_data="alert_dp_done")])
+    field, text = SINGLE_SELECT_MENUS[prefix.rsplit('_', 1)[1]]
+    selected_value = next(iter(get_alert_prefs(context)[field].values()), None)
+
+    keyboard = render_option_rows(ALERT_MENU_BUTTONS[prefix], lambda option_id: option_id == selected_value)
+    keyboard += ALERT_MENU_FOOTERS[prefix]
     query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
-    return ALERT_PREFERENCES
+    return EDIT_ALERT_PREFERENCES if prefix.startswith("edit_") else ALERT_PREFERENCES
 
-def alert_date_posted_selected(update: Update, context: CallbackContext):
-    query = update.callback_query
-    query.answer()
+def alert_single_select_toggled(update: Update, context: CallbackContext):
+    prefix, kind, option_id, option_text = SINGLE_SELECT_CALLBACK_RE.match(update.callback_query.data).groups()
     prefs = get_alert_prefs(context)
-    
-    _, _, option_id, option_text = update.callback_query.data.split('_', 3)
+    field = SINGLE_SELECT_MENUS[kind][0]
 
-    if option_id == 'clear':
-        prefs['date_posted'] = {}
+    # Clearing, or clicking the already-selected option, deselects it
+    if option_id == 'clear' or option_id in prefs[field].values():
+        prefs[field] = {}
     else:
-        # Check if this option is already selected - if yes, deselect it
-        if option_id in prefs['date_posted'].values():
-            prefs['date_posted'] = {}
-        else:
-            prefs['date_posted'] = {option_text: option_id}
+        prefs[field] = {option_text: option_id}
 
     # Re-render the menu to show the change
-    return show_alert_date_posted_menu(update, context)
+    return show_alert_single_select_menu(update, context, prefix)
 
 def alert_preferences_done(update: Update, context: CallbackContext):
     """Return to alert preferences menu from a sub-menu."""
@@ -1281,44 +1796,6 @@ def alert_preferences_done(update: Update, context: CallbackContext):
     query.edit_message_text(text, reply_markup=keyboard, parse_mode=ParseMode.MARKDOWN)
     return ALERT_PREFERENCES
 
-def show_alert_workplace_menu(update: Update, context: CallbackContext):
-    query = update.callback_query
-    query.answer()
-    
-    prefs = get_alert_prefs(context)
-    selected_value = list(prefs['workplace'].values())[0] if prefs['workplace'] else None
-
-    text = "🏢 Choose Workplace Type for This Alert"
-    keyboard = []
-    for option_text, option_id in WORKPLACE_TYPES.items():
-        is_selected = selected_value == option_id
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"alert_wt_{option_id}_{option_text}")])
-    
-    keyboard.append([InlineKeyboardButton("Clear Filter", callback_data="alert_wt_clear_None")])
-    keyboard.append([InlineKeyboardButton("✔️ Done", callback_data="alert_wt_done")])
-    query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
-    return ALERT_PREFERENCES
-
-def alert_workplace_selected(update: Update, context: CallbackContext):
-    query = update.callback_query
-    query.answer()
-    prefs = get_alert_prefs(context)
-    
-    _, _, option_id, option_text = update.callback_query.data.split('_', 3)
-
-    if option_id == 'clear':
-        prefs['workplace'] = {}
-    else:
-        # Check if this option is already selected - if yes, deselect it
-        if option_id in prefs['workplace'].values():
-            prefs['workplace'] = {}
-        else:
-            prefs['workplace'] = {option_text: option_id}
-
-    # Re-render the menu to show the change
-    return show_alert_workplace_menu(update, context)
-
 def show_alert_multi_select_menu(update: Update, context: CallbackContext, menu_type: str):
     query = update.callback_query
     query.answer()
@@ -1327,12 +1804,10 @@ def show_alert_multi_select_menu(update: Update, context: CallbackContext, menu_
     
     if menu_type == 'experience':
         title = "🎓 Choose Experience Levels for This Alert"
-        options_dict = EXPERIENCE_LEVELS
         selected_options = prefs['experience']
         callback_prefix = "alert_exp"
     else: # job_type
         title = "📝 Choose Job Types for This Alert"
-        options_dict = JOB_TYPES
         selected_options = prefs['job_types']
         callback_prefix = "alert_jt"
         
@@ -1340,13 +1815,9 @@ def show_alert_multi_select_menu(update: Update, context: CallbackContext, menu_
            "▫️ Click to select/deselect options\n" \
            "▫️ Click 'Done' when finished."
            
-    keyboard = []
-    for option_text, option_id in options_dict.items():
-        is_selected = option_id in selected_options.values()
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"{callback_prefix}_{option_id}_{option_text}")])
-    
-    keyboard.append([InlineKeyboardButton("✔️ Done", callback_data=f"{callback_prefix}_done")])
+    selected_ids = set(selected_options.values())
+    keyboard = render_option_rows(ALERT_MENU_BUTTONS[callback_prefix], selected_ids.__contains__)
+    keyboard += ALERT_MENU_FOOTERS[callback_prefix]
     query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
     return ALERT_PREFERENCES
 
@@ -1373,66 +1844,45 @@ def alert_toggle_multi_select_option(update: Update, context: CallbackContext, m
 
     return show_alert_multi_select_menu(update, context, menu_type)
 
-def my_alerts(update: Update, context: CallbackContext):
-    """Display a list of user's alerts with manage options in a cleaner two-level UI."""
-    query = update.callback_query
-    safe_answer_callback_query(query)
-    
-    chat_id = query.from_user.id
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    alerts = cursor.execute("SELECT * FROM alerts WHERE chat_id = ?", (chat_id,)).fetchall()
-    conn.close()
+def make_my_alerts_menu(chat_id) -> (str, InlineKeyboardMarkup):
+    alerts = get_alert_list(chat_id)
 
     if not alerts:
-        text = "📋 *Your Alerts*\n\nYou have no alerts set up yet."
-        keyboard = [
-            [InlineKeyboardButton("➕ Add New Alert", callback_data="add_alert")],
-            [InlineKeyboardButton("🔙 Back to Alerts Menu", callback_data="alerts_menu")]
-        ]
-        if query:
-            try:
-                query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode=ParseMode.MARKDOWN)
-            except telegram.error.BadRequest as e:
-                if "message is not modified" not in str(e).lower():
-                    raise e
-        else:
-            update.message.reply_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode=ParseMode.MARKDOWN)
-        return MY_ALERTS
+        return "📋 *Your Alerts*\n\nYou have no alerts set up yet.", NO_ALERTS_KEYBOARD
 
-    text = f"📋 *Your Alerts* ({len(alerts)} active)\n\nClick on any alert to manage it:"
+    text = MY_ALERTS_TEMPLATE.format(count=len(alerts))
     keyboard = []
     
     for alert in alerts:
         status_icon = "🟢" if alert['is_active'] else "🔴"
-        status_text = "Active" if alert['is_active'] else "Paused"
         
         # Clean, condensed alert display
         alert_line = f"{status_icon} {alert['keywords']} • {alert['location']}"
-        keyboard.append([InlineKeyboardButton(alert_line, callback_data=f"view_alert_{alert['id']}")])
+        keyboard.append([InlineKeyboardButton(alert_line, callback_data=f"va|{alert['id']}")])
     
     # Add management buttons at bottom
-    keyboard.append([InlineKeyboardButton("➕ Add New Alert", callback_data="add_alert")])
-    keyboard.append([InlineKeyboardButton("🔙 Back to Alerts Menu", callback_data="alerts_menu")])
+    keyboard += MY_ALERTS_FOOTER
+    return text, InlineKeyboardMarkup(keyboard)
+
+def my_alerts(update: Update, context: CallbackContext):
+    """Display a list of user's alerts with manage options in a cleaner two-level UI."""
+    query = update.callback_query
+    safe_answer_callback_query(query)
     
+    # Markup is built once, before either send path
+    text, reply_markup = make_my_alerts_menu(update.effective_user.id)
     if query:
-        try:
-            query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode=ParseMode.MARKDOWN)
-        except telegram.error.BadRequest as e:
-            if "message is not modified" not in str(e).lower():
-                raise e
+        with ignore_not_modified():
+            query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.MARKDOWN)
     else:
-        update.message.reply_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode=ParseMode.MARKDOWN)
+        update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.MARKDOWN)
     return MY_ALERTS
 
-def view_alert_details(update: Update, context: CallbackContext):
+def view_alert_details(update: Update, context: CallbackContext, alert_id):
     """Show detailed view of a specific alert with management options."""
     query = update.callback_query
     query.answer()
     
-    _, _, alert_id = query.data.split('_')
-    
     conn = get_db_connection()
     cursor = conn.cursor()
     alert = cursor.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,)).fetchone()
@@ -1441,21 +1891,11 @@ def view_alert_details(update: Update, context: CallbackContext):
         query.edit_message_text("❌ Alert not found.")
         return MY_ALERTS
     
-    # Get filter details
-    filters = json.loads(alert['filters'])
-    experience = ", ".join(filters['experience'].keys()) or "Any"
-    job_types = ", ".join(filters['job_types'].keys()) or "Any"
-    date_posted = list(filters['date_posted'].keys())[0] if filters['date_posted'] else "Any"
-    workplace = list(filters['workplace'].keys())[0] if filters['workplace'] else "Any"
-    
     # Count jobs sent for this alert
     sent_count = cursor.execute("SELECT COUNT(*) FROM sent_jobs WHERE alert_id = ?", (alert_id,)).fetchone()[0]
     
     # Fetch user's timezone
-    tz_row = cursor.execute("SELECT timezone FROM user_settings WHERE chat_id = ?", (query.from_user.id,)).fetchone()
-    conn.close() # Close connection after all DB queries are done
-    
-    user_timezone_str = tz_row['timezone'] if tz_row and tz_row['timezone'] else 'UTC'
+    user_timezone_str = get_user_timezone(context, query.from_user.id) or 'UTC'
     
     # --- FIX: Define status icons before using them ---
     status_icon = "🟢" if alert['is_active'] else "🔴"
@@ -1466,9 +1906,9 @@ def view_alert_details(update: Update, context: CallbackContext):
     if last_checked_utc_str:
         try:
             # Timestamp from DB is UTC
-            utc_dt = datetime.strptime(last_checked_utc_str.split('.')[0], '%Y-%m-%d %H:%M:%S').replace(tzinfo=pytz.utc)
+            utc_dt = parse_db_timestamp(last_checked_utc_str)
             
-            user_tz = pytz.timezone(user_timezone_str)
+            user_tz = get_tz(user_timezone_str)
             local_dt = utc_dt.astimezone(user_tz)
             
             last_checked_display = local_dt.strftime('%Y-%m-%d %H:%M')
@@ -1477,107 +1917,87 @@ def view_alert_details(update: Update, context: CallbackContext):
         except (ValueError, pytz.UnknownTimeZoneError):
             last_checked_display = last_checked_utc_str[:16] + " (UTC)"
 
-    text = (
-        f"🔔 *Alert Details*\n\n"
-        f"📝 *Keywords:* {alert['keywords']}\n"
-        f"📍 *Location:* {alert['location']}\n"
-        f"📊 *Status:* {status_icon} {status_text}\n"
-        f"📬 *Jobs Sent:* {sent_count}\n\n"
-        f"*Current Filters:*\n"
-        f"∙ *Date Posted:* `{date_posted}`\n"
-        f"∙ *Workplace:* `{workplace}`\n"
-        f"∙ *Experience:* `{experience}`\n"
-        f"∙ *Job Types:* `{job_types}`\n\n"
-        f"🕒 Last checked: {last_checked_display}"
-    )
+    text = ALERT_DETAILS_TEMPLATE.format_map(describe_filters(
+        json.loads(alert['filters']),
+        keywords=alert['keywords'],
+        location=alert['location'],
+        status=f"{status_icon} {status_text}",
+        sent_count=sent_count,
+        last_checked=last_checked_display,
+    ))
     
     # Action buttons based on current status
     action_text = "⏸️ Pause Alert" if alert['is_active'] else "▶️ Resume Alert"
-    action_cb = f"pause_alert_{alert_id}" if alert['is_active'] else f"resume_alert_{alert_id}"
+    action_cb = f"pa|{alert_id}" if alert['is_active'] else f"ra|{alert_id}"
     
-    keyboard = [
+    reply_markup = InlineKeyboardMarkup([
         [InlineKeyboardButton(action_text, callback_data=action_cb)],
-        [InlineKeyboardButton("⚙️ Edit Preferences", callback_data=f"edit_alert_{alert_id}")],
-        [InlineKeyboardButton("🗑️ Delete Alert", callback_data=f"delete_alert_start_{alert_id}")],
-        [InlineKeyboardButton("⬅️ Back to Alerts", callback_data="my_alerts")]
-    ]
+        [InlineKeyboardButton("⚙️ Edit Preferences", callback_data=f"ea|{alert_id}")],
+        [InlineKeyboardButton("🗑️ Delete Alert", callback_data=f"ds|{alert_id}")],
+        BACK_TO_ALERTS_ROW
+    ])
     
-    try:
-        query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode=ParseMode.MARKDOWN)
-    except telegram.error.BadRequest as e:
-        if "message is not modified" not in str(e).lower():
-            raise e
+    with ignore_not_modified():
+        query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.MARKDOWN)
     
     return MY_ALERTS
 
-def toggle_alert_status(update: Update, context: CallbackContext):
-    """Pause or resume an alert."""
+def toggle_alert_status(update: Update, context: CallbackContext, alert_id, new_status):
+    """Pause (new_status=0) or resume (new_status=1) an alert."""
     query = update.callback_query
-    action, _, alert_id = query.data.split('_')
-    new_status = 0 if action == 'pause' else 1
 
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute("UPDATE alerts SET is_active = ? WHERE id = ?", (new_status, alert_id))
     conn.commit()
-    conn.close()
+    set_cached_alert_status(query.from_user.id, int(alert_id), new_status)
 
     query.answer(f"Alert {'paused' if new_status == 0 else 'resumed'}.")
-    # Refresh the list
+    # Refresh the list (served from the patched cache, no query)
     return my_alerts(update, context)
 
-def delete_alert_start(update: Update, context: CallbackContext):
+def delete_alert_start(update: Update, context: CallbackContext, alert_id):
     """Ask for confirmation before deleting an alert."""
     query = update.callback_query
-    _, _, _, alert_id = query.data.split('_')
     
     text = "Are you sure you want to permanently delete this alert?"
-    keyboard = [
+    reply_markup = InlineKeyboardMarkup([
         [
-            InlineKeyboardButton("Yes, Delete", callback_data=f"delete_alert_confirm_{alert_id}"),
-            InlineKeyboardButton("No, Cancel", callback_data="my_alerts")
+            InlineKeyboardButton("Yes, Delete", callback_data=f"dc|{alert_id}"),
+            CANCEL_TO_ALERTS_BUTTON
         ]
-    ]
+    ])
     query.answer()
-    try:
-        query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
-    except telegram.error.BadRequest as e:
-        if "message is not modified" not in str(e).lower():
-            raise e
+    with ignore_not_modified():
+        query.edit_message_text(text, reply_markup=reply_markup)
     return MY_ALERTS
 
-def delete_alert_confirm(update: Update, context: CallbackContext):
+def delete_alert_confirm(update: Update, context: CallbackContext, alert_id):
     """Delete the alert and all associated sent jobs from the database."""
     query = update.callback_query
-    _, _, _, alert_id = query.data.split('_')
 
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Delete associated sent jobs first (although CASCADE should handle this)
-    cursor.execute("DELETE FROM sent_jobs WHERE alert_id = ?", (alert_id,))
-    
-    # Delete the alert (this should also cascade delete sent_jobs due to FOREIGN KEY constraint)
+    # Delete the alert; its sent_jobs rows go with it through the ON DELETE CASCADE foreign key
     cursor.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
     
     conn.commit()
-    conn.close()
+    invalidate_sent_jobs_cache(query.from_user.id)
+    drop_cached_alert(query.from_user.id, int(alert_id))
 
     query.answer("Alert and all associated job records deleted.")
     return my_alerts(update, context)
 
-def edit_alert_start(update: Update, context: CallbackContext):
+def edit_alert_start(update: Update, context: CallbackContext, alert_id):
     """Start editing an existing alert's preferences."""
     query = update.callback_query
     query.answer()
     
-    _, _, alert_id = query.data.split('_')
-    
     # Load existing alert data
     conn = get_db_connection()
     cursor = conn.cursor()
     alert = cursor.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,)).fetchone()
-    conn.close()
     
     if not alert:
         query.edit_message_text("❌ Alert not found.")
@@ -1596,35 +2016,32 @@ def edit_alert_start(update: Update, context: CallbackContext):
     query.edit_message_text(text, reply_markup=keyboard, parse_mode=ParseMode.MARKDOWN)
     return EDIT_ALERT_PREFERENCES
 
+# Per-alert buttons carry compact "<action>|<alert_id>" callback data, decoded with one
+# partition and routed through a dict instead of one regex handler per action
+ALERT_ACTIONS = {
+    'va': view_alert_details,
+    'pa': partial(toggle_alert_status, new_status=0),
+    'ra': partial(toggle_alert_status, new_status=1),
+    'ea': edit_alert_start,
+    'ds': delete_alert_start,
+    'dc': delete_alert_confirm,
+}
+ALERT_ACTION_PATTERN = re.compile(f"^({'|'.join(ALERT_ACTIONS)})\\|")
+
+def alert_action(update: Update, context: CallbackContext):
+    """Dispatch a per-alert button press to its handler."""
+    action, _, alert_id = update.callback_query.data.partition('|')
+    return ALERT_ACTIONS[action](update, context, alert_id)
+
 def make_edit_alert_preferences_menu(context: CallbackContext) -> (str, InlineKeyboardMarkup):
     """Create the edit alert preferences menu."""
     prefs = get_alert_prefs(context)
-    keywords = context.user_data.get('alert_keywords', 'N/A')
-    location = context.user_data.get('alert_location', 'N/A')
-    alert_id = context.user_data.get('editing_alert_id', 'N/A')
-    
-    experience = ", ".join(prefs['experience'].keys()) or "Any"
-    job_types = ", ".join(prefs['job_types'].keys()) or "Any"
-    date_posted = list(prefs['date_posted'].keys())[0] if prefs['date_posted'] else "Any"
-    workplace = list(prefs['workplace'].keys())[0] if prefs['workplace'] else "Any"
-    
-    text = (
-        f"⚙️ *Edit Alert Preferences*\n\n"
-        f"📝 *Keywords:* {keywords}\n"
-        f"📍 *Location:* {location}\n\n"
-        f"*Current Filters:*\n"
-        f"∙ *Date Posted:* `{date_posted}`\n"
-        f"∙ *Workplace:* `{workplace}`\n"
-        f"∙ *Experience:* `{experience}`\n"
-        f"∙ *Job Types:* `{job_types}`"
-    )
-    keyboard = [
-        [InlineKeyboardButton("🗓️ Date Posted", callback_data="edit_alert_set_date_posted"), InlineKeyboardButton("🏢 Workplace", callback_data="edit_alert_set_workplace")],
-        [InlineKeyboardButton("🎓 Experience", callback_data="edit_alert_set_experience"), InlineKeyboardButton("📝 Job Types", callback_data="edit_alert_set_job_types")],
-        [InlineKeyboardButton("✅ Save Changes", callback_data="edit_alert_save_final")],
-        [InlineKeyboardButton("❌ Cancel", callback_data="my_alerts")]
-    ]
-    return text, InlineKeyboardMarkup(keyboard)
+    text = EDIT_ALERT_PREFERENCES_TEMPLATE.format_map(describe_filters(
+        prefs,
+        keywords=context.user_data.get('alert_keywords', 'N/A'),
+        location=context.user_data.get('alert_location', 'N/A'),
+    ))
+    return text, EDIT_ALERT_PREFERENCES_KEYBOARD
 
 def edit_alert_save_final(update: Update, context: CallbackContext):
     """Save the updated alert preferences."""
@@ -1640,11 +2057,10 @@ def edit_alert_save_final(update: Update, context: CallbackContext):
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
-        "UPDATE alerts SET filters = ? WHERE id = ?",
-        (filters_json, alert_id)
+        "UPDATE alerts SET filters = ?, f_E = ?, f_JT = ?, f_TPR = ?, f_WT = ? WHERE id = ?",
+        (filters_json, *alert_filter_values(prefs), alert_id)
     )
     conn.commit()
-    conn.close()
     
     # Clean up editing data
     context.user_data.pop('editing_alert_id', None)
@@ -1655,8 +2071,9 @@ def edit_alert_save_final(update: Update, context: CallbackContext):
     query.edit_message_text(f"✅ Alert preferences for '{keywords}' in '{location}' have been updated successfully!")
     
     # Go back to My Alerts after a delay
-    time.sleep(2)
-    return my_alerts(update, context)
+    text, keyboard = make_my_alerts_menu(query.from_user.id)
+    show_menu_later(context, query.message, text, keyboard, delay=2, parse_mode=ParseMode.MARKDOWN)
+    return MY_ALERTS
 
 def edit_alert_preferences_done(update: Update, context: CallbackContext):
     """Return to edit alert preferences menu from a sub-menu."""
@@ -1666,82 +2083,6 @@ def edit_alert_preferences_done(update: Update, context: CallbackContext):
     query.edit_message_text(text, reply_markup=keyboard, parse_mode=ParseMode.MARKDOWN)
     return EDIT_ALERT_PREFERENCES
 
-# Alert preference handlers for editing (reuse existing logic but with different callbacks)
-def show_edit_alert_date_posted_menu(update: Update, context: CallbackContext):
-    query = update.callback_query
-    query.answer()
-    
-    prefs = get_alert_prefs(context)
-    selected_value = list(prefs['date_posted'].values())[0] if prefs['date_posted'] else None
-
-    text = "🗓️ Choose Date Posted Filter for This Alert"
-    keyboard = []
-    for option_text, option_id in DATE_POSTED_OPTIONS.items():
-        is_selected = selected_value == option_id
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"edit_alert_dp_{option_id}_{option_text}")])
-    
-    keyboard.append([InlineKeyboardButton("Clear Filter", callback_data="edit_alert_dp_clear_None")])
-    keyboard.append([InlineKeyboardButton("✔️ Done", callback_data="edit_alert_dp_done")])
-    query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
-    return EDIT_ALERT_PREFERENCES
-
-def edit_alert_date_posted_selected(update: Update, context: CallbackContext):
-    query = update.callback_query
-    query.answer()
-    prefs = get_alert_prefs(context)
-    
-    _, _, _, option_id, option_text = update.callback_query.data.split('_', 4)
-
-    if option_id == 'clear':
-        prefs['date_posted'] = {}
-    else:
-        # Check if this option is already selected - if yes, deselect it
-        if option_id in prefs['date_posted'].values():
-            prefs['date_posted'] = {}
-        else:
-            prefs['date_posted'] = {option_text: option_id}
-
-    # Re-render the menu to show the change
-    return show_edit_alert_date_posted_menu(update, context)
-
-# Similar handlers for workplace, experience, and job types for editing...
-def show_edit_alert_workplace_menu(update: Update, context: CallbackContext):
-    query = update.callback_query
-    query.answer()
-    
-    prefs = get_alert_prefs(context)
-    selected_value = list(prefs['workplace'].values())[0] if prefs['workplace'] else None
-
-    text = "🏢 Choose Workplace Type for This Alert"
-    keyboard = []
-    for option_text, option_id in WORKPLACE_TYPES.items():
-        is_selected = selected_value == option_id
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"edit_alert_wt_{option_id}_{option_text}")])
-    
-    keyboard.append([InlineKeyboardButton("Clear Filter", callback_data="edit_alert_wt_clear_None")])
-    keyboard.append([InlineKeyboardButton("✔️ Done", callback_data="edit_alert_wt_done")])
-    query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
-    return EDIT_ALERT_PREFERENCES
-
-def edit_alert_workplace_selected(update: Update, context: CallbackContext):
-    query = update.callback_query
-    query.answer()
-    prefs = get_alert_prefs(context)
-    
-    _, _, _, option_id, option_text = update.callback_query.data.split('_', 4)
-
-    if option_id == 'clear':
-        prefs['workplace'] = {}
-    else:
-        if option_id in prefs['workplace'].values():
-            prefs['workplace'] = {}
-        else:
-            prefs['workplace'] = {option_text: option_id}
-
-    return show_edit_alert_workplace_menu(update, context)
-
 def show_edit_alert_multi_select_menu(update: Update, context: CallbackContext, menu_type: str):
     query = update.callback_query
     query.answer()
@@ -1750,12 +2091,10 @@ def show_edit_alert_multi_select_menu(update: Update, context: CallbackContext,
     
     if menu_type == 'experience':
         title = "🎓 Choose Experience Levels for This Alert"
-        options_dict = EXPERIENCE_LEVELS
         selected_options = prefs['experience']
         callback_prefix = "edit_alert_exp"
     else: # job_type
         title = "📝 Choose Job Types for This Alert"
-        options_dict = JOB_TYPES
         selected_options = prefs['job_types']
         callback_prefix = "edit_alert_jt"
         
@@ -1763,13 +2102,9 @@ def show_edit_alert_multi_select_menu(update: Update, context: CallbackContext,
            "▫️ Click to select/deselect options\n" \
            "▫️ Click 'Done' when finished."
            
-    keyboard = []
-    for option_text, option_id in options_dict.items():
-        is_selected = option_id in selected_options.values()
-        display_text = f"✅ {option_text}" if is_selected else option_text
-        keyboard.append([InlineKeyboardButton(display_text, callback_data=f"{callback_prefix}_{option_id}_{option_text}")])
-    
-    keyboard.append([InlineKeyboardButton("✔️ Done", callback_data=f"{callback_prefix}_done")])
+    selected_ids = set(selected_options.values())
+    keyboard = render_option_rows(ALERT_MENU_BUTTONS[callback_prefix], selected_ids.__contains__)
+    keyboard += ALERT_MENU_FOOTERS[callback_prefix]
     query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
     return EDIT_ALERT_PREFERENCES
 
@@ -1796,122 +2131,188 @@ def edit_alert_toggle_multi_select_option(update: Update, context: CallbackConte
 
     return show_edit_alert_multi_select_menu(update, context, menu_type)
 
+def make_callback_router(routes: dict, prefix_routes: tuple):
+    """Build one handler for a whole conversation state.
+
+    Exact callback data is looked up in routes; anything else goes to the first handler in
+    prefix_routes whose prefix it starts with. Exact matches win, so '*_done' buttons never
+    reach the option handler that shares their prefix.
+    """
+    def route(update: Update, context: CallbackContext):
+        data = update.callback_query.data
+        handler = routes.get(data)
+        if handler is None:
+            handler = next((fn for prefix, fn in prefix_routes if data.startswith(prefix)), None)
+        if handler is None:
+            logger.warning(f"No route for callback data {data!r}")
+            safe_answer_callback_query(update.callback_query)
+            return None
+        return handler(update, context)
+    return route
+
+def alert_preference_routes(scope: str, show_multi_select_menu, toggle_multi_select_option, done):
+    """Routes for the alert or edit-alert preference state; scope is 'alert' or 'edit_alert'.
+
+    Saving is not routed here: it has its own run_async handler, while these in-memory menu
+    updates stay synchronous so quick successive clicks are handled in order.
+    """
+    routes = {
+        f"{scope}_set_date_posted": partial(show_alert_single_select_menu, prefix=f"{scope}_dp"),
+        f"{scope}_set_workplace": partial(show_alert_single_select_menu, prefix=f"{scope}_wt"),
+        f"{scope}_set_experience": partial(show_multi_select_menu, menu_type='experience'),
+        f"{scope}_set_job_types": partial(show_multi_select_menu, menu_type='job_type'),
+    }
+    routes.update({f"{scope}_{kind}_done": done for kind in ("dp", "wt", "exp", "jt")})
+    prefix_routes = (
+        (f"{scope}_dp_", alert_single_select_toggled),
+        (f"{scope}_wt_", alert_single_select_toggled),
+        (f"{scope}_exp_", partial(toggle_multi_select_option, menu_type='experience')),
+        (f"{scope}_jt_", partial(toggle_multi_select_option, menu_type='job_type')),
+    )
+    return routes, prefix_routes
+
+ALERT_PREFERENCE_ROUTES, ALERT_PREFERENCE_PREFIX_ROUTES = alert_preference_routes(
+    "alert", show_alert_multi_select_menu, alert_toggle_multi_select_option, alert_preferences_done
+)
+ALERT_PREFERENCE_ROUTES['alert_set_filters'] = alert_set_filters
+EDIT_ALERT_PREFERENCE_ROUTES, EDIT_ALERT_PREFERENCE_PREFIX_ROUTES = alert_preference_routes(
+    "edit_alert", show_edit_alert_multi_select_menu, edit_alert_toggle_multi_select_option, edit_alert_preferences_done
+)
+route_alert_preferences = make_callback_router(ALERT_PREFERENCE_ROUTES, ALERT_PREFERENCE_PREFIX_ROUTES)
+route_edit_alert_preferences = make_callback_router(EDIT_ALERT_PREFERENCE_ROUTES, EDIT_ALERT_PREFERENCE_PREFIX_ROUTES)
+ALERT_PREFERENCE_PATTERN = re.compile(r'^alert_')
+EDIT_ALERT_PREFERENCE_PATTERN = re.compile(r'^edit_alert_')
+
+def scrape_alert(alert):
+    """Runs the LinkedIn scrape and LLM filter for one stored alert."""
+    filter_dict = {col: alert[col] for col in ALERT_FILTER_COLUMNS}
+    return scrape_linkedin_with_llm_filter(alert['keywords'], alert['location'], filter_dict, progress_msg=None)
+
 def check_all_alerts(bot: Bot):
     """Scheduled job to check all active alerts with robust deduplication."""
     logger.info("Scheduler running: Checking all active alerts...")
     conn = get_db_connection()
+    
+    # Alerts are scraped in parallel (the shared rate windows and slots keep LinkedIn and Gemini
+    # within limits). Telegram's per-chat limit only applies within a chat, so each chat's alerts
+    # are notified in order by one worker while different chats are notified concurrently.
+    alerts_by_chat = {}
+    with ThreadPoolExecutor(max_workers=ALERT_SCRAPE_WORKERS) as scrape_executor, \
+            ThreadPoolExecutor(max_workers=TELEGRAM_SEND_WORKERS) as send_executor:
+        # Rows are streamed from the cursor, so each scrape is queued as soon as its row is read
+        for alert in conn.execute("SELECT * FROM alerts WHERE is_active = 1"):
+            alerts_by_chat.setdefault(alert['chat_id'], []).append((alert, scrape_executor.submit(scrape_alert, alert)))
+        preload_sent_job_keys(alerts_by_chat)
+        notify_futures = [send_executor.submit(notify_chat, bot, chat_alerts) for chat_alerts in alerts_by_chat.values()]
+        for future in notify_futures:
+            future.result()
+
+    logger.info("Scheduler finished checking alerts.")
+
+def notify_chat(bot: Bot, chat_alerts):
+    """Handles the scraped results of one chat's alerts, pacing messages to that chat."""
+    chat_rate = RateWindow(1.2)  # Rate limit: max 20 messages per 30 seconds per chat
+    for alert, future in chat_alerts:
+        check_alert_results(bot, alert, future, chat_rate)
+
+def check_alert_results(bot: Bot, alert, future, chat_rate):
+    """Sends the new jobs found for one alert and records them as sent."""
+    conn = get_db_connection()
     cursor = conn.cursor()
+    logger.info(f"Checking alert ID {alert['id']} for chat ID {alert['chat_id']}...")
+    try:
+        found_jobs = future.result()
+    except Exception as e:
+        logger.error(f"Scrape failed for alert ID {alert['id']}: {e}")
+        return
+
+    # --- Robust De-duplication ---
+    # All jobs already sent for this chat (across all alerts), served from the in-memory cache
+    sent_job_ids, sent_canonical_pairs = get_sent_job_keys(alert['chat_id'])
     
-    active_alerts = cursor.execute("SELECT * FROM alerts WHERE is_active = 1").fetchall()
+    # Parse last_checked for date filtering. Jobs posted before it (with a 5-minute grace period)
+    # are older than max_age, so each job only needs its memoized age compared against it.
+    max_age = None
+    if alert['last_checked']:
+        try:
+            last_checked = parse_db_timestamp(alert['last_checked'])
+            max_age = datetime.now(pytz.UTC) - (last_checked - timedelta(minutes=5))
+        except ValueError:
+            logger.warning(f"Could not parse last_checked timestamp for alert {alert['id']}")
+    
+    # Canonical keys for every job, computed in one pass up front
+    job_keys = [
+        (canonical_link(job['Link']), canonical_text(job['Title']), canonical_text(job['Company']))
+        for job in found_jobs
+    ]
     
-    for alert in active_alerts:
-        logger.info(f"Checking alert ID {alert['id']} for chat ID {alert['chat_id']}...")
-        filters = json.loads(alert['filters'])
-        
-        filter_dict = {
-            'f_E': ",".join(filters['experience'].values()),
-            'f_JT': ",".join(filters['job_types'].values()),
-            'f_TPR': list(filters['date_posted'].values())[0] if filters['date_posted'] else None,
-            'f_WT': list(filters['workplace'].values())[0] if filters['workplace'] else None
-        }
-
-        # Scrape all pages dynamically and apply LLM filtering
-        found_jobs = scrape_linkedin_with_llm_filter(alert['keywords'], alert['location'], filter_dict, progress_msg=None)
-        
-        # --- Robust De-duplication ---
-        # Get all jobs already sent for this chat (across all alerts) for better deduplication
-        cursor.execute("SELECT job_id, canonical_title, canonical_company FROM sent_jobs WHERE chat_id = ?", (alert['chat_id'],))
-        sent_jobs = cursor.fetchall()
-        sent_job_ids = {row['job_id'] for row in sent_jobs}
-        sent_canonical_pairs = {(row['canonical_title'], row['canonical_company']) for row in sent_jobs}
+    sent_jobs = []  # Written to sent_jobs in one batch after the loop
+    for job, (job_id, canonical_title, canonical_company) in zip(found_jobs, job_keys):
+        # Check if this job is a duplicate using robust methods
+        is_duplicate = (
+            job_id in sent_job_ids or
+            (canonical_title, canonical_company) in sent_canonical_pairs
+        )
         
-        # Parse last_checked for date filtering
-        last_checked = None
-        if alert['last_checked']:
+        # Optional: Skip jobs older than last check (with 5-minute grace period)
+        if max_age is not None and not is_duplicate:
             try:
-                last_checked = datetime.strptime(alert['last_checked'].split('.')[0], '%Y-%m-%d %H:%M:%S').replace(tzinfo=pytz.UTC)
-            except ValueError:
-                logger.warning(f"Could not parse last_checked timestamp for alert {alert['id']}")
-        
-        new_jobs_found = 0
-        for job in found_jobs:
-            # Extract job ID and canonical text
-            job_id = canonical_link(job['Link'])
-            canonical_title = canonical_text(job['Title'])
-            canonical_company = canonical_text(job['Company'])
+                posted_age = parse_posted_age(job['Date Posted'])
+                if posted_age > max_age:
+                    logger.debug(f"Skipping old job: {job['Title']} (posted {posted_age} ago, last checked {max_age} ago)")
+                    continue
+            except Exception as e:
+                logger.warning(f"Could not parse job date '{job['Date Posted']}': {e}")
+                # Continue processing if date parsing fails
+
+        if not is_duplicate:
+            # Escape HTML special characters to prevent parsing errors
+            title = html.escape(job['Title'])
+            company = html.escape(job['Company'])
+            location = html.escape(job['Location'])
+            date_posted = html.escape(job['Date Posted'])
+            keywords = html.escape(alert['keywords'])
+            alert_location = html.escape(alert['location'])
             
-            # Check if this job is a duplicate using robust methods
-            is_duplicate = (
-                job_id in sent_job_ids or
-                (canonical_title, canonical_company) in sent_canonical_pairs
+            message = (
+                f"🔔 <b>New Job Alert!</b>\n\n"
+                f"<b>{title}</b>\n"
+                f"<i>{company}</i> - {location}\n"
+                f"Posted: {date_posted}\n\n"
+                f"From your alert for: <b>{keywords}</b> in <b>{alert_location}</b>"
             )
+            keyboard = [[InlineKeyboardButton("View Job", url=job['Link']), InlineKeyboardButton("📋 My Alerts", callback_data="my_alerts")]]
             
-            # Optional: Skip jobs older than last check (with 5-minute grace period)
-            if last_checked and not is_duplicate:
-                try:
-                    job_posted_time = parse_date_posted_to_datetime(job['Date Posted'])
-                    if job_posted_time < last_checked - timedelta(minutes=5):
-                        logger.debug(f"Skipping old job: {job['Title']} (posted {job_posted_time}, last checked {last_checked})")
-                        continue
-                except Exception as e:
-                    logger.warning(f"Could not parse job date '{job['Date Posted']}': {e}")
-                    # Continue processing if date parsing fails
-
-            if not is_duplicate:
-                new_jobs_found += 1
-                
-                # Escape HTML special characters to prevent parsing errors
-                title = html.escape(job['Title'])
-                company = html.escape(job['Company'])
-                location = html.escape(job['Location'])
-                date_posted = html.escape(job['Date Posted'])
-                keywords = html.escape(alert['keywords'])
-                alert_location = html.escape(alert['location'])
-                
-                message = (
-                    f"🔔 <b>New Job Alert!</b>\n\n"
-                    f"<b>{title}</b>\n"
-                    f"<i>{company}</i> - {location}\n"
-                    f"Posted: {date_posted}\n\n"
-                    f"From your alert for: <b>{keywords}</b> in <b>{alert_location}</b>"
+            try:
+                chat_rate.wait()
+                telegram_send_rate.wait()
+                bot.send_message(
+                    chat_id=alert['chat_id'],
+                    text=message,
+                    reply_markup=InlineKeyboardMarkup(keyboard),
+                    parse_mode=ParseMode.HTML
                 )
-                keyboard = [[InlineKeyboardButton("View Job", url=job['Link']), InlineKeyboardButton("📋 My Alerts", callback_data="my_alerts")]]
+                sent_jobs.append(job)
                 
-                try:
-                    bot.send_message(
-                        chat_id=alert['chat_id'],
-                        text=message,
-                        reply_markup=InlineKeyboardMarkup(keyboard),
-                        parse_mode=ParseMode.HTML
-                    )
-                    # Add to sent_jobs table with all the new fields
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO sent_jobs 
-                        (alert_id, chat_id, job_link, job_id, job_title, company, canonical_title, canonical_company) 
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (alert['id'], alert['chat_id'], job['Link'], job_id, job['Title'], job['Company'], canonical_title, canonical_company))
-                    conn.commit()
-                    
-                    # Update our in-memory sets for this session
-                    sent_job_ids.add(job_id)
-                    sent_canonical_pairs.add((canonical_title, canonical_company))
-                    
-                    time.sleep(1.2)  # Rate limit: max 20 messages per 30 seconds per chat
-                except telegram.error.BadRequest as e:
-                    logger.error(f"Failed to send alert to {alert['chat_id']}: {e}")
-                except Exception as e:
-                    logger.error(f"An unexpected error occurred sending to {alert['chat_id']}: {e}")
-
-        if new_jobs_found > 0:
-            logger.info(f"Sent {new_jobs_found} new job(s) for alert ID {alert['id']}.")
-
-        # Update last_checked timestamp
-        cursor.execute("UPDATE alerts SET last_checked = CURRENT_TIMESTAMP WHERE id = ?", (alert['id'],))
-        conn.commit()
-        time.sleep(5) # Stagger requests between alerts
+                # Update the cached sets for this chat
+                sent_job_ids.add(job_id)
+                sent_canonical_pairs.add((canonical_title, canonical_company))
+            except telegram.error.BadRequest as e:
+                logger.error(f"Failed to send alert to {alert['chat_id']}: {e}")
+            except Exception as e:
+                logger.error(f"An unexpected error occurred sending to {alert['chat_id']}: {e}")
 
-    conn.close()
-    logger.info("Scheduler finished checking alerts.")
+    if sent_jobs:
+        try:
+            record_sent_jobs(conn, alert['id'], alert['chat_id'], sent_jobs)
+        except sqlite3.IntegrityError:
+            # The alert was deleted while it was being checked; its rows are no longer wanted
+            logger.info(f"Alert ID {alert['id']} was deleted during the check; not recording its jobs.")
+        logger.info(f"Sent {len(sent_jobs)} new job(s) for alert ID {alert['id']}.")
+
+    # Update last_checked timestamp
+    cursor.execute("UPDATE alerts SET last_checked = CURRENT_TIMESTAMP WHERE id = ?", (alert['id'],))
+    conn.commit()
 
 # --- New Timezone Functions ---
 def set_timezone_start(update: Update, context: CallbackContext):
@@ -1931,7 +2332,7 @@ def timezone_received(update: Update, context: CallbackContext):
     user_timezone = update.message.text.strip()
     try:
         # Validate timezone
-        pytz.timezone(user_timezone)
+        get_tz(user_timezone)
         
         # Save to DB
         chat_id = update.message.chat_id
@@ -1942,7 +2343,7 @@ def timezone_received(update: Update, context: CallbackContext):
             (chat_id, user_timezone)
         )
         conn.commit()
-        conn.close()
+        context.user_data['timezone'] = user_timezone
 
         update.message.reply_text(f"✅ Timezone set to `{user_timezone}`.", parse_mode=ParseMode.MARKDOWN)
         
@@ -1958,6 +2359,77 @@ def timezone_received(update: Update, context: CallbackContext):
         )
         return SET_TIMEZONE
 
+# Handlers per conversation state, built once at import. Variants of a handler are bound with
+# partial rather than lambdas so tracebacks name the real function.
+CONVERSATION_STATES = {
+    MAIN_MENU: [
+        CallbackQueryHandler(preferences_menu, pattern='^prefs$'),
+        CallbackQueryHandler(start_search_flow, pattern='^start_search$'),
+        CallbackQueryHandler(alerts_menu, pattern='^set_alert$'),
+        CallbackQueryHandler(my_alerts, pattern=MY_ALERTS_PATTERN),
+    ],
+    PREFERENCES_MENU: [
+        CallbackQueryHandler(show_date_posted_menu, pattern='^set_date_posted$'),
+        CallbackQueryHandler(show_workplace_menu, pattern='^set_workplace$'),
+        CallbackQueryHandler(partial(show_multi_select_menu, menu_type='experience'), pattern='^set_experience$'),
+        CallbackQueryHandler(partial(show_multi_select_menu, menu_type='job_type'), pattern='^set_job_types$'),
+        CallbackQueryHandler(set_timezone_start, pattern='^set_timezone$'),
+        CallbackQueryHandler(main_menu, pattern=MAIN_MENU_PATTERN)
+    ],
+    ALERTS_MENU: [
+        CallbackQueryHandler(add_alert_start, pattern=ADD_ALERT_PATTERN),
+        CallbackQueryHandler(my_alerts, pattern=MY_ALERTS_PATTERN),
+        CallbackQueryHandler(main_menu, pattern=MAIN_MENU_PATTERN),
+    ],
+    MY_ALERTS: [
+        CallbackQueryHandler(add_alert_start, pattern=ADD_ALERT_PATTERN),
+        CallbackQueryHandler(alerts_menu, pattern='^alerts_menu$'),
+        CallbackQueryHandler(alert_action, pattern=ALERT_ACTION_PATTERN),
+        CallbackQueryHandler(my_alerts, pattern=MY_ALERTS_PATTERN), # To refresh after cancel
+    ],
+    ADD_ALERT_KEYWORD: [MessageHandler(Filters.text & ~Filters.command, add_alert_keyword_received)],
+    ADD_ALERT_LOCATION: [MessageHandler(Filters.text & ~Filters.command, add_alert_location_received)],
+    SET_TIMEZONE: [MessageHandler(Filters.text & ~Filters.command, timezone_received)],
+    GET_SEARCH_KEYWORD: [MessageHandler(Filters.text & ~Filters.command, keyword_received)],
+    # Scrapes run for tens of seconds; run_async keeps them off the update-dispatch thread
+    GET_SEARCH_LOCATION: [MessageHandler(Filters.text & ~Filters.command, location_received, run_async=True)],
+    DATE_POSTED_MENU: [
+        CallbackQueryHandler(preferences_menu, pattern=PREFERENCES_DONE_PATTERN),
+        CallbackQueryHandler(date_posted_selected, pattern='^dp_(?!done$)')
+    ],
+    WORKPLACE_MENU: [
+        CallbackQueryHandler(preferences_menu, pattern=PREFERENCES_DONE_PATTERN),
+        CallbackQueryHandler(workplace_selected, pattern='^wt_(?!done$)')
+    ],
+    EXPERIENCE_MENU: [
+        CallbackQueryHandler(preferences_menu, pattern=PREFERENCES_DONE_PATTERN),
+        CallbackQueryHandler(partial(toggle_multi_select_option, menu_type='experience'), pattern='^exp_(?!done$)')
+    ],
+    JOB_TYPE_MENU: [
+        CallbackQueryHandler(preferences_menu, pattern=PREFERENCES_DONE_PATTERN),
+        CallbackQueryHandler(partial(toggle_multi_select_option, menu_type='job_type'), pattern='^jt_(?!done$)')
+    ],
+    BROWSING: [
+        CallbackQueryHandler(page_navigation, pattern='^page_'),
+        CallbackQueryHandler(ignore_callback, pattern='^ignore$'),
+        CallbackQueryHandler(close_browsing, pattern='^close$'),
+        CallbackQueryHandler(my_alerts, pattern=MY_ALERTS_PATTERN),
+    ],
+    # Saving runs the baseline scrape (or a DB write) off the dispatch thread; menu clicks stay synchronous
+    ALERT_PREFERENCES: [
+        CallbackQueryHandler(alert_save_final, pattern='^alert_save_final$', run_async=True),
+        CallbackQueryHandler(alert_skip_filters, pattern='^alert_skip_filters$', run_async=True),
+        CallbackQueryHandler(route_alert_preferences, pattern=ALERT_PREFERENCE_PATTERN),
+    ],
+    EDIT_ALERT_PREFERENCES: [
+        CallbackQueryHandler(edit_alert_save_final, pattern='^edit_alert_save_final$', run_async=True),
+        CallbackQueryHandler(route_edit_alert_preferences, pattern=EDIT_ALERT_PREFERENCE_PATTERN),
+        CallbackQueryHandler(my_alerts, pattern=MY_ALERTS_PATTERN),
+    ],
+    # While a run_async handler is still running, PTB only consults this state
+    ConversationHandler.WAITING: [CallbackQueryHandler(still_working)],
+}
+
 def main():
     import argparse
     import sys
@@ -1991,7 +2463,13 @@ def main():
     scheduler.add_job(check_all_alerts, 'interval', minutes=30, args=[bot_instance])
     scheduler.start()
 
-    updater = Updater(token, use_context=True)
+    def shutdown_scheduler():
+        # Safe to call more than once: main's finally and atexit both do
+        if scheduler.running:
+            scheduler.shutdown(wait=False)
+    atexit.register(shutdown_scheduler)
+
+    updater = Updater(token, workers=DISPATCHER_WORKERS, use_context=True)
     dispatcher = updater.dispatcher
     
     # Add error handler for timeout and other errors
@@ -2008,108 +2486,33 @@ def main():
     
     conv_handler = ConversationHandler(
         entry_points=[CommandHandler('start', start)],
-        states={
-            MAIN_MENU: [
-                CallbackQueryHandler(preferences_menu, pattern='^prefs$'),
-                CallbackQueryHandler(start_search_flow, pattern='^start_search$'),
-                CallbackQueryHandler(alerts_menu, pattern='^set_alert$'),
-                CallbackQueryHandler(my_alerts, pattern='^my_alerts$'),
-            ],
-            PREFERENCES_MENU: [
-                CallbackQueryHandler(show_date_posted_menu, pattern='^set_date_posted$'),
-                CallbackQueryHandler(show_workplace_menu, pattern='^set_workplace$'),
-                CallbackQueryHandler(lambda u, c: show_multi_select_menu(u, c, 'experience'), pattern='^set_experience$'),
-                CallbackQueryHandler(lambda u, c: show_multi_select_menu(u, c, 'job_type'), pattern='^set_job_types$'),
-                CallbackQueryHandler(set_timezone_start, pattern='^set_timezone$'),
-                CallbackQueryHandler(main_menu, pattern='^main_menu$')
-            ],
-            ALERTS_MENU: [
-                CallbackQueryHandler(add_alert_start, pattern='^add_alert$'),
-                CallbackQueryHandler(my_alerts, pattern='^my_alerts$'),
-                CallbackQueryHandler(main_menu, pattern='^main_menu$'),
-            ],
-            MY_ALERTS: [
-                CallbackQueryHandler(add_alert_start, pattern='^add_alert$'),
-                CallbackQueryHandler(alerts_menu, pattern='^alerts_menu$'),
-                CallbackQueryHandler(view_alert_details, pattern='^view_alert_'),
-                CallbackQueryHandler(toggle_alert_status, pattern='^(pause|resume)_alert_'),
-                CallbackQueryHandler(edit_alert_start, pattern='^edit_alert_'),
-                CallbackQueryHandler(delete_alert_start, pattern='^delete_alert_start_'),
-                CallbackQueryHandler(delete_alert_confirm, pattern='^delete_alert_confirm_'),
-                CallbackQueryHandler(my_alerts, pattern='^my_alerts$'), # To refresh after cancel
-            ],
-            ADD_ALERT_KEYWORD: [MessageHandler(Filters.text & ~Filters.command, add_alert_keyword_received)],
-            ADD_ALERT_LOCATION: [MessageHandler(Filters.text & ~Filters.command, add_alert_location_received)],
-            SET_TIMEZONE: [MessageHandler(Filters.text & ~Filters.command, timezone_received)],
-            GET_SEARCH_KEYWORD: [MessageHandler(Filters.text & ~Filters.command, keyword_received)],
-            GET_SEARCH_LOCATION: [MessageHandler(Filters.text & ~Filters.command, location_received)],
-            DATE_POSTED_MENU: [
-                CallbackQueryHandler(preferences_menu, pattern='^dp_done$'),
-                CallbackQueryHandler(date_posted_selected, pattern='^dp_')
-            ],
-            WORKPLACE_MENU: [
-                CallbackQueryHandler(preferences_menu, pattern='^wt_done$'),
-                CallbackQueryHandler(workplace_selected, pattern='^wt_')
-            ],
-            EXPERIENCE_MENU: [
-                CallbackQueryHandler(preferences_menu, pattern='^exp_done$'),
-                CallbackQueryHandler(lambda u, c: toggle_multi_select_option(u, c, 'experience'), pattern='^exp_')
-            ],
-            JOB_TYPE_MENU: [
-                CallbackQueryHandler(preferences_menu, pattern='^jt_done$'),
-                CallbackQueryHandler(lambda u, c: toggle_multi_select_option(u, c, 'job_type'), pattern='^jt_')
-            ],
-            BROWSING: [
-                CallbackQueryHandler(page_navigation, pattern='^page_'),
-                CallbackQueryHandler(ignore_callback, pattern='^ignore$'),
-                CallbackQueryHandler(close_browsing, pattern='^close$'),
-                CallbackQueryHandler(my_alerts, pattern='^my_alerts$'),
-            ],
-            ALERT_PREFERENCES: [
-                CallbackQueryHandler(alert_skip_filters, pattern='^alert_skip_filters$'),
-                CallbackQueryHandler(alert_set_filters, pattern='^alert_set_filters$'),
-                CallbackQueryHandler(show_alert_date_posted_menu, pattern='^alert_set_date_posted$'),
-                CallbackQueryHandler(show_alert_workplace_menu, pattern='^alert_set_workplace$'),
-                CallbackQueryHandler(lambda u, c: show_alert_multi_select_menu(u, c, 'experience'), pattern='^alert_set_experience$'),
-                CallbackQueryHandler(lambda u, c: show_alert_multi_select_menu(u, c, 'job_type'), pattern='^alert_set_job_types$'),
-                CallbackQueryHandler(alert_preferences_done, pattern='^alert_dp_done$'),
-                CallbackQueryHandler(alert_preferences_done, pattern='^alert_wt_done$'),
-                CallbackQueryHandler(alert_preferences_done, pattern='^alert_exp_done$'),
-                CallbackQueryHandler(alert_preferences_done, pattern='^alert_jt_done$'),
-                CallbackQueryHandler(alert_date_posted_selected, pattern='^alert_dp_'),
-                CallbackQueryHandler(alert_workplace_selected, pattern='^alert_wt_'),
-                CallbackQueryHandler(lambda u, c: alert_toggle_multi_select_option(u, c, 'experience'), pattern='^alert_exp_'),
-                CallbackQueryHandler(lambda u, c: alert_toggle_multi_select_option(u, c, 'job_type'), pattern='^alert_jt_'),
-                CallbackQueryHandler(alert_save_final, pattern='^alert_save_final$'),
-            ],
-            EDIT_ALERT_PREFERENCES: [
-                CallbackQueryHandler(show_edit_alert_date_posted_menu, pattern='^edit_alert_set_date_posted$'),
-                CallbackQueryHandler(show_edit_alert_workplace_menu, pattern='^edit_alert_set_workplace$'),
-                CallbackQueryHandler(lambda u, c: show_edit_alert_multi_select_menu(u, c, 'experience'), pattern='^edit_alert_set_experience$'),
-                CallbackQueryHandler(lambda u, c: show_edit_alert_multi_select_menu(u, c, 'job_type'), pattern='^edit_alert_set_job_types$'),
-                CallbackQueryHandler(edit_alert_preferences_done, pattern='^edit_alert_dp_done$'),
-                CallbackQueryHandler(edit_alert_preferences_done, pattern='^edit_alert_wt_done$'),
-                CallbackQueryHandler(edit_alert_preferences_done, pattern='^edit_alert_exp_done$'),
-                CallbackQueryHandler(edit_alert_preferences_done, pattern='^edit_alert_jt_done$'),
-                CallbackQueryHandler(edit_alert_date_posted_selected, pattern='^edit_alert_dp_'),
-                CallbackQueryHandler(edit_alert_workplace_selected, pattern='^edit_alert_wt_'),
-                CallbackQueryHandler(lambda u, c: edit_alert_toggle_multi_select_option(u, c, 'experience'), pattern='^edit_alert_exp_'),
-                CallbackQueryHandler(lambda u, c: edit_alert_toggle_multi_select_option(u, c, 'job_type'), pattern='^edit_alert_jt_'),
-                CallbackQueryHandler(edit_alert_save_final, pattern='^edit_alert_save_final$'),
-                CallbackQueryHandler(my_alerts, pattern='^my_alerts$'),
-            ],
-        },
+        states=CONVERSATION_STATES,
         fallbacks=[CommandHandler('cancel', cancel), CommandHandler('start', start)],
         allow_reentry=True
     )
     dispatcher.add_handler(conv_handler)
-    logger.info("Bot started polling...")
-    # Make sure to gracefully shutdown the scheduler
+    # With WEBHOOK_URL set, Telegram pushes updates to WEBHOOK_URL/<token> instead of the bot
+    # long-polling for them. TLS is terminated in front of the bot (reverse proxy or hosting
+    # platform), which forwards plain HTTP to PORT here. Without it the bot polls, e.g. for local runs.
+    webhook_url = os.getenv("WEBHOOK_URL")
+    # Make sure to gracefully shutdown the scheduler, however idle() returns or raises
     try:
-        updater.start_polling()
+        if webhook_url:
+            updater.start_webhook(
+                listen="0.0.0.0",
+                port=int(os.getenv("PORT", "8443")),
+                url_path=token,
+                webhook_url=f"{webhook_url.rstrip('/')}/{token}",
+                allowed_updates=ALLOWED_UPDATES,
+            )
+            logger.info("Bot started with webhook...")
+        else:
+            updater.start_polling(poll_interval=0.0, timeout=POLL_TIMEOUT, allowed_updates=ALLOWED_UPDATES)
+            logger.info("Bot started polling...")
         updater.idle()
-    except (KeyboardInterrupt, SystemExit):
-        scheduler.shutdown()
+    finally:
+        shutdown_scheduler()
+        updater.stop()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file